@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""Run every benchmark and compare the results with a baseline file."""
+
+import sys
+import json
+import argparse
+import platform
+
+from benchs import bench_call, bench_memory, bench_algebra, bench_advices
+
+BENCHS = [bench_call, bench_algebra, bench_advices, bench_memory]
+
+PATH = "benchs/baseline.json"
+
+
+def measure():
+    """Return the results of every benchmark (lower is better)."""
+    results = {}
+
+    for bench in BENCHS:
+        results.update(bench.run())
+
+    return results
+
+
+def load(path):
+    """Return the results of a baseline file (or None)."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)["results"]
+    except FileNotFoundError:
+        return None
+
+
+def save(path, results):
+    """Write the results (and the environment) in a baseline file."""
+    baseline = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+
+def compare(baseline, results, tolerance):
+    """Print the ratio of each result to its baseline (and regressions)."""
+    regressions = []
+    print("{:<32} {:>12} {:>12} {:>8}".format("bench", "base", "new", "ratio"))
+
+    for name, value in results.items():
+        base = baseline.get(name)
+
+        if not base:
+            print("{:<32} {:>12} {:>12.2f}".format(name, "-", value))
+            continue
+
+        ratio = value / base
+        flag = " !" if ratio > 1 + tolerance else ""
+        print(
+            "{:<32} {:>12.2f} {:>12.2f} {:>8.2f}{}".format(
+                name, base, value, ratio, flag
+            )
+        )
+
+        if flag:
+            regressions.append(name)
+
+    return regressions
+
+
+def main(argv=None):
+    """Compare a run with the baseline (or save it as the baseline)."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--path", default=PATH, help="baseline file")
+    parser.add_argument("--save", action="store_true", help="save the run")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="ratio above the baseline reported as a regression",
+    )
+    args = parser.parse_args(argv)
+    results = measure()
+    baseline = load(args.path)
+
+    if args.save or baseline is None:
+        save(args.path, results)
+        print("saved {} results in {}".format(len(results), args.path))
+
+        return 0
+
+    regressions = compare(baseline, results, args.tolerance)
+
+    if regressions:
+        print("{} regressions: {}".format(len(regressions), regressions))
+
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""Benchmark the per-call overhead of advices against a bare function."""
+
+import os
+import timeit
+import logging
+import tempfile
+
+from functools import reduce
+
+from gampy import advices
+
+
+def inc(x):
+    return x + 1
+
+
+def noop():
+    pass
+
+
+LOGGER = logging.getLogger("benchs.disabled")
+LOGGER.disabled = True
+
+DIRECTORY = tempfile.TemporaryDirectory()  # removed at exit
+
+
+def stack():
+    return [
+        advices.exceptional(),
+        advices.retryable(),
+        advices.loggable(LOGGER),
+        advices.optional(0),
+    ]
+
+
+def nested(*stack):
+    return lambda f: reduce(lambda g, advice: advice(g), stack, f)
+
+
+ADVICES = {
+    "bare": advices.identical,
+    "cacheable": advices.cacheable,
+    "persistable": lambda: advices.persistable(
+        os.path.join(DIRECTORY.name, "cache.db")
+    ),
+    "vectorizable": advices.vectorizable,
+    "constable": advices.constable,
+    "flippable": advices.flippable,
+    "fluentable": advices.fluentable,
+    "preable": lambda: advices.preable(noop),
+    "postable": lambda: advices.postable(noop),
+    "optional": lambda: advices.optional(0),
+    "retryable": advices.retryable,
+    "timeoutable": advices.timeoutable,
+    "exceptional": advices.exceptional,
+    "profilable": advices.profilable,
+    "loggable": lambda: advices.loggable(LOGGER),
+    "traceable": lambda: advices.traceable(LOGGER),
+    "nested": lambda: nested(*stack()),
+    "fused": lambda: advices.fused(*stack()),
+}
+
+
+def bench(number=100000):
+    """Return the time per call (in µs) of inc with each advice."""
+    times = []
+
+    for make in ADVICES.values():
+        f = make()(inc)
+        f(0)  # warm caches
+        seconds = min(timeit.repeat(lambda: f(0), number=number, repeat=5))
+        times.append(seconds / number * 1e6)
+
+    return times
+
+
+def run():
+    """Return call times (in µs) by advice."""
+    return {"advice/{}".format(a): t for a, t in zip(ADVICES, bench())}
+
+
+def main():
+    """Print the time per call and the overhead of each advice."""
+    print("{:>12} {:>10} {:>10}".format("advice", "call", "overhead"))
+    times = bench()
+
+    for advice, time in zip(ADVICES, times):
+        print(
+            "{:>12} {:>10.2f} {:>10.2f}".format(advice, time, time - times[0])
+        )
+
+
+if __name__ == "__main__":
+    main()
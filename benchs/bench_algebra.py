@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""Benchmark pipeline operators against the number of steps."""
+
+import timeit
+
+from operator import add
+
+from gampy import Pipeline
+from gampy.advices import identical
+
+
+def inc(x):
+    return x + 1
+
+
+SIZES = (10, 100, 1000, 10000)
+
+OPERATORS = {
+    "build": lambda p, q: Pipeline(p.steps),
+    "or": lambda p, q: p | inc,
+    "add": lambda p, q: p + q,
+    "and": lambda p, q: p & q,
+    "sub": lambda p, q: p - q,
+    "xor": lambda p, q: p ^ q,
+    "mod": lambda p, q: p % q,
+    "mul": lambda p, q: p * 1000,
+    "slice": lambda p, q: p[1:-1],
+    "matmul": lambda p, q: p @ identical(),
+    "apply": lambda p, q: (p @ identical()).apply(),
+    "digest": lambda p, q: Pipeline(p.storage.flat).digest,
+}
+
+
+def bench(n, number=None):
+    """Return the time per operation (in µs) on pipelines of n steps."""
+    number = number or max(1, 10000 // n)
+    p = Pipeline([(add, [i]) for i in range(n)])
+    q = Pipeline([(add, [i]) for i in range(n // 2, n + n // 2)])
+    times = []
+
+    for operator in OPERATORS.values():
+        seconds = min(
+            timeit.repeat(lambda: operator(p, q), number=number, repeat=5)
+        )
+        times.append(seconds / number * 1e6)
+
+    return times
+
+
+def run():
+    """Return operator times (in µs) by operator and pipeline size."""
+    results = {}
+
+    for n in SIZES:
+        for operator, time in zip(OPERATORS, bench(n)):
+            results["algebra/{}/{}".format(operator, n)] = time
+
+    return results
+
+
+def main():
+    """Print operator times for several pipeline sizes."""
+    print(("{:>8}" + " {:>10}" * len(SIZES)).format("operator", *SIZES))
+    times = [bench(n) for n in SIZES]
+
+    for i, operator in enumerate(OPERATORS):
+        row = [t[i] for t in times]
+        print(("{:>8}" + " {:>10.2f}" * len(SIZES)).format(operator, *row))
+
+
+if __name__ == "__main__":
+    main()
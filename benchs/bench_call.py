@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""Benchmark pipeline calls: reduce, flat loop, compile, observe and fuse."""
+
+import timeit
+
+from operator import add
+
+from gampy import Pipeline
+
+
+def inc(x):
+    return x + 1
+
+
+def odd(x):
+    return x % 2
+
+
+DEPTHS = (1, 10, 100, 1000)
+
+STAGES = (1, 10, 100)  # pairs of element-wise steps (map and filter)
+
+MODES = {
+    "reduce": lambda p: p(),
+    "flat": lambda p: p(flat=True),
+    "compile": lambda p: p.compile(),
+    "observe": lambda p: p.observe(),  # without subscribers
+}
+
+
+def bench(p, number=1000):
+    """Return the time per call (in µs) of each pipeline mode (or nan)."""
+    times = []
+
+    for mode in MODES:
+        f = MODES[mode](p)
+
+        try:
+            seconds = min(timeit.repeat(lambda: f(0), number=number, repeat=5))
+            times.append(seconds / number * 1e6)
+        except RecursionError:
+            times.append(float("nan"))
+
+    return times
+
+
+def stages(n):
+    """Return a pipeline of n pairs of element-wise steps (and a sum)."""
+    return Pipeline([(map, [inc]), (filter, [odd])] * n + [sum])
+
+
+def bench_fuse(p, items=1000, number=20):
+    """Return the time per item (in µs) of p called as is and fused."""
+    times = []
+    data = range(items)
+
+    for f in [p(), p.fuse()[0]()]:
+        seconds = min(timeit.repeat(lambda: f(data), number=number, repeat=5))
+        times.append(seconds / number / items * 1e6)
+
+    return times
+
+
+def run():
+    """Return call times (in µs) by mode and pipeline depth."""
+    results = {}
+
+    for n in DEPTHS:
+        p = Pipeline([inc, (add, [1])] * n)
+
+        for mode, time in zip(MODES, bench(p)):
+            if time == time:  # not nan
+                results["call/{}/{}".format(mode, len(p))] = time
+
+    for n in STAGES:
+        p = stages(n)
+        plain, fused = bench_fuse(p)
+        results["call/unfused/{}".format(len(p))] = plain
+        results["call/fuse/{}".format(len(p))] = fused
+
+    return results
+
+
+def main():
+    """Print call times for several pipeline depths."""
+    print(("{:>8}" + " {:>10}" * len(MODES)).format("depth", *MODES))
+
+    for n in DEPTHS:
+        p = Pipeline([inc, (add, [1])] * n)
+        times = bench(p)
+
+        print(("{:>8}" + " {:>10.2f}" * len(MODES)).format(len(p), *times))
+
+    print()
+    print(
+        "{:>8} {:>10} {:>10} {:>10}".format(
+            "stages", "unfused", "fuse", "speedup"
+        )
+    )
+
+    for n in STAGES:
+        p = stages(n)
+        plain, fused = bench_fuse(p)
+
+        print(
+            "{:>8} {:>10.3f} {:>10.3f} {:>10.2f}".format(
+                len(p), plain, fused, plain / fused
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
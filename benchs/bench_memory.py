@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""Benchmark the memory of pipelines per step."""
+
+import tracemalloc
+
+from operator import add
+
+from gampy import Pipeline
+
+
+def inc(x):
+    return x + 1
+
+
+def digested(p):
+    p.digest  # keep the cached keys and digests
+
+    return p
+
+
+N = 10000
+
+SHAPES = {
+    "bare": lambda: Pipeline([inc] * N),
+    "args": lambda: Pipeline([(add, [i]) for i in range(N)]),
+    "kwargs": lambda: Pipeline([(add, [], {"x": i}) for i in range(N)]),
+    "digest": lambda: digested(Pipeline([(add, [i]) for i in range(N)])),
+    "repeat": lambda: Pipeline([inc]) * N,
+}
+
+
+def allocated(make):
+    """Return the bytes still allocated by the result of make."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = make()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+
+    return after - before
+
+
+def bench():
+    """Return the memory (in bytes) per step of each pipeline shape."""
+    return [allocated(make) / N for make in SHAPES.values()]
+
+
+def run():
+    """Return the memory (in bytes) per step by pipeline shape."""
+    return {"memory/{}".format(s): b for s, b in zip(SHAPES, bench())}
+
+
+def main():
+    """Print the memory per step of several pipeline shapes."""
+    print("{:>8} {:>10}".format("shape", "bytes"))
+
+    for shape, nbytes in zip(SHAPES, bench()):
+        print("{:>8} {:>10.1f}".format(shape, nbytes))
+
+
+if __name__ == "__main__":
+    main()
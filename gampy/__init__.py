@@ -6,6 +6,6 @@
 
 """Init module of the project."""
 
-from gampy import advices
+from gampy import advices, caches, events, profiles, functions
 
-from gampy.structures import Pipeline
+from gampy.structures import Pipeline, PipelineView, FrozenPipeline
@@ -6,13 +6,26 @@
 
 """Advices of the project."""
 
+import time
+import pickle
+import random
+import reprlib
+import asyncio
 import logging
 
-from typing import Any, Type, Callable
+from typing import Any, Type, Tuple, Union, Callable, Optional
 
-from functools import wraps, lru_cache
+from inspect import isawaitable, iscoroutinefunction
+from itertools import count
+from functools import wraps, partial, lru_cache
 
-from gampy.structures import Advice
+from gampy import functions
+from gampy.hooks import Hooks, fused
+from gampy.errors import DeadlineError, DefinitionError
+from gampy.caches import MISSING, Cache, DiskCache, Keyed
+from gampy.caches import CacheInfo, cachekey, hashable
+from gampy.profiles import Profile, timed
+from gampy.structures import Advice, digest
 
 
 # In[ ]:
@@ -24,15 +37,172 @@ def identical() -> Advice:
     def advice(f):
         return f
 
+    advice.hooks = lambda f: Hooks()
+
     return advice
 
 
 # In[16]:
 
 
-def cacheable(n: int = 128, typed: bool = False) -> Advice:
-    """Cache the n most recent results."""
-    return lru_cache(n, typed)
+def cacheable(
+    n: Optional[int] = 128,
+    typed: bool = False,
+    ttl: Optional[float] = None,
+    size: Optional[int] = None,
+    policy: str = "lru",
+    cache: Optional[Any] = None,
+) -> Advice:
+    """Cache the results of f (n entries, size bytes, ttl seconds)."""
+    bounded = ttl is None and size is None and policy == "lru"
+
+    def advice(f):
+        if bounded and cache is None and not iscoroutinefunction(f):
+            return lrucached(f, n, typed)
+
+        store = Cache(n, size, ttl, policy) if cache is None else cache
+
+        if iscoroutinefunction(f):
+            tasks: dict = dict()  # concurrent calls share a task
+
+            @wraps(f)
+            async def awrapped(*args, **kwargs):
+                key = cachekey(args, kwargs, typed)
+
+                if key is None:  # not cacheable
+                    return await f(*args, **kwargs)
+
+                state = store.get(key, MISSING)
+
+                if state is not MISSING:
+                    return state
+
+                if key not in tasks:
+                    tasks[key] = asyncio.ensure_future(f(*args, **kwargs))
+
+                try:
+                    state = await asyncio.shield(tasks[key])
+                finally:
+                    tasks.pop(key, None)  # failures are not cached
+
+                store.set(key, state)
+
+                return state
+
+            awrapped.cache_info = store.info
+            awrapped.cache_clear = store.clear
+
+            return awrapped
+
+        @wraps(f)
+        def wrapped(*args, **kwargs):
+            key = cachekey(args, kwargs, typed)
+
+            if key is None:  # not cacheable
+                return f(*args, **kwargs)
+
+            state = store.get(key, MISSING)
+
+            if state is MISSING:
+                state = f(*args, **kwargs)
+                store.set(key, state)
+
+            return state
+
+        wrapped.cache_info = store.info
+        wrapped.cache_clear = store.clear
+
+        return wrapped
+
+    return advice
+
+
+def lrucached(f: Callable, n: Optional[int], typed: bool) -> Callable:
+    """Cache the results of f in an lru_cache (by content if unhashable)."""
+
+    def call(*args, **kwargs):
+        if len(args) == 1 and type(args[0]) is Keyed:
+            keyed = args[0]
+
+            return f(*keyed.args, **keyed.kwargs)
+
+        return f(*args, **kwargs)
+
+    fast = lru_cache(n, typed)(call)
+
+    @wraps(f)
+    def wrapped(*args, **kwargs):
+        try:
+            return fast(*args, **kwargs)  # hashable arguments
+        except TypeError:
+            if hashable(args, kwargs):
+                raise  # raised by f
+
+        key = cachekey(args, kwargs, typed)
+
+        if key is None:  # not cacheable
+            return f(*args, **kwargs)
+
+        return fast(Keyed(key, args, kwargs))
+
+    def info():
+        hits, misses, maxsize, currsize = fast.cache_info()
+        full = maxsize is not None and currsize >= maxsize > 0
+        evictions = misses - currsize if full else 0  # estimated
+
+        return CacheInfo(hits, misses, evictions, 0, maxsize, currsize, 0)
+
+    wrapped.cache_info = info
+    wrapped.cache_clear = fast.cache_clear
+
+    return wrapped
+
+
+# In[ ]:
+
+
+def persistable(
+    path: str,
+    size: Optional[int] = None,
+    typed: bool = False,
+    dumps: Callable[[Any], bytes] = pickle.dumps,
+    loads: Callable[[bytes], Any] = pickle.loads,
+    warm: int = 0,
+) -> Advice:
+    """Cache the results of f in a file (shared by processes)."""
+
+    def advice(f):
+        try:
+            space = digest(f)  # by content (stable across processes)
+        except TypeError:
+            raise DefinitionError(
+                "A persistable function should have a content digest. "
+                "Not: {}.".format(type(f).__name__)
+            ) from None
+
+        cache = DiskCache(path, size, dumps, loads, warm, space=space)
+
+        return cacheable(typed=typed, cache=cache)(f)
+
+    return advice
+
+
+# In[ ]:
+
+
+def vectorizable() -> Advice:
+    """Mark f as applicable on a whole array."""
+
+    def advice(f):
+        @wraps(f)
+        def wrapped(*args, **kwargs):
+            return f(*args, **kwargs)
+
+        wrapped.vectorizable = True
+
+        return wrapped
+
+    return advice
 
 
 # In[3]:
@@ -42,6 +212,14 @@ def constable(x: Any = None) -> Advice:
     """Return x constantly."""
 
     def advice(f):
+        if iscoroutinefunction(f):
+
+            @wraps(f)
+            async def awrapped(*_, **__):
+                return x
+
+            return awrapped
+
         @wraps(f)
         def wrapped(*_, **__):
             return x
@@ -58,6 +236,14 @@ def flippable() -> Advice:
     """Flip f arguments."""
 
     def advice(f):
+        if iscoroutinefunction(f):
+
+            @wraps(f)
+            async def awrapped(*args, **kwargs):
+                return await f(*reversed(args), **kwargs)
+
+            return awrapped
+
         @wraps(f)
         def wrapped(*args, **kwargs):
             return f(*reversed(args), **kwargs)
@@ -74,6 +260,19 @@ def fluentable(n: int = 0) -> Advice:
     """Return the nth argument of f."""
 
     def advice(f):
+        if iscoroutinefunction(f):
+
+            @wraps(f)
+            async def awrapped(*args, **kwargs):
+                state = await f(*args, **kwargs)
+
+                try:
+                    return args[n]
+                except IndexError:
+                    return state
+
+            return awrapped
+
         @wraps(f)
         def wrapped(*args, **kwargs):
             state = f(*args, **kwargs)
@@ -85,6 +284,14 @@ def fluentable(n: int = 0) -> Advice:
 
         return wrapped
 
+    def post(state, args):
+        try:
+            return args[n]
+        except IndexError:
+            return state
+
+    advice.hooks = lambda f: Hooks(lambda args, kwargs: args, post)
+
     return advice
 
 
@@ -95,6 +302,19 @@ def preable(do: Callable[[], None]) -> Advice:
     """Call do before f."""
 
     def advice(f):
+        if iscoroutinefunction(f):
+
+            @wraps(f)
+            async def awrapped(*args, **kwargs):
+                done = do()
+
+                if isawaitable(done):
+                    await done
+
+                return await f(*args, **kwargs)
+
+            return awrapped
+
         @wraps(f)
         def wrapped(*args, **kwargs):
             do()
@@ -103,6 +323,14 @@ def preable(do: Callable[[], None]) -> Advice:
 
         return wrapped
 
+    def hooks(f):
+        if iscoroutinefunction(do):
+            return None  # awaited by the wrapper
+
+        return Hooks(pre=lambda args, kwargs: do())
+
+    advice.hooks = hooks
+
     return advice
 
 
@@ -113,6 +341,20 @@ def postable(do: Callable[[], None]) -> Advice:
     """Call do after f."""
 
     def advice(f):
+        if iscoroutinefunction(f):
+
+            @wraps(f)
+            async def awrapped(*args, **kwargs):
+                state = await f(*args, **kwargs)
+                done = do()
+
+                if isawaitable(done):
+                    await done
+
+                return state
+
+            return awrapped
+
         @wraps(f)
         def wrapped(*args, **kwargs):
             state = f(*args, **kwargs)
@@ -122,6 +364,19 @@ def postable(do: Callable[[], None]) -> Advice:
 
         return wrapped
 
+    def post(state, _):
+        do()
+
+        return state
+
+    def hooks(f):
+        if iscoroutinefunction(do):
+            return None  # awaited by the wrapper
+
+        return Hooks(post=post)
+
+    advice.hooks = hooks
+
     return advice
 
 
@@ -132,6 +387,19 @@ def optional(x: Any) -> Advice:
     """Return x when f returns None."""
 
     def advice(f):
+        if iscoroutinefunction(f):
+
+            @wraps(f)
+            async def awrapped(*args, **kwargs):
+                state = await f(*args, **kwargs)
+
+                if state is None:
+                    return x
+
+                return state
+
+            return awrapped
+
         @wraps(f)
         def wrapped(*args, **kwargs):
             state = f(*args, **kwargs)
@@ -143,6 +411,11 @@ def optional(x: Any) -> Advice:
 
         return wrapped
 
+    def post(state, _):
+        return x if state is None else state
+
+    advice.hooks = lambda f: Hooks(post=post)
+
     return advice
 
 
@@ -150,23 +423,123 @@ def optional(x: Any) -> Advice:
 
 
 def retryable(
-    d: Any = None, n: int = 3, on: Type[Exception] = Exception
+    d: Any = None,
+    n: int = 3,
+    on: Type[Exception] = Exception,
+    w: float = 0,
+    backoff: float = 1,
+    jitter: float = 0,
 ) -> Advice:
-    """Retry f n times until success."""
+    """Retry f n times until success (wait w * backoff ** i seconds)."""
+
+    def delay(i):
+        """Return the wait before try i + 1 (within the deadline)."""
+        wait = w * backoff ** i
+        wait -= wait * jitter * random.random()
+        left = functions.remaining()
+
+        if left is not None and wait >= left:
+            raise DeadlineError("The deadline would pass before a retry.")
+
+        return wait
 
     def advice(f):
+        if iscoroutinefunction(f):
+
+            @wraps(f)
+            async def awrapped(*args, **kwargs):
+                for i in range(n):
+                    functions.check()
+
+                    try:
+                        return await f(*args, **kwargs)
+                    except on:
+                        if i < n - 1:
+                            await asyncio.sleep(delay(i))
+
+                return d
+
+            return awrapped
+
         @wraps(f)
         def wrapped(*args, **kwargs):
-            for _ in range(n):
+            for i in range(n):
+                functions.check()
+
                 try:
                     return f(*args, **kwargs)
                 except on:
-                    pass
+                    if i < n - 1:
+                        time.sleep(delay(i))
 
             return d
 
         return wrapped
 
+    def retry(error, i):
+        return delay(i) if isinstance(error, on) and i < n - 1 else None
+
+    def default(error, _):
+        if isinstance(error, on):
+            return d
+
+        raise error
+
+    def check(args, kwargs):
+        functions.check()
+
+    advice.hooks = lambda f: Hooks(check, None, default, retry)
+
+    return advice
+
+
+# In[ ]:
+
+
+def timeoutable(t: Optional[float] = None) -> Advice:
+    """Raise a DeadlineError if f takes more than t seconds (or the budget)."""
+
+    def budget():
+        """Return the seconds left for a call of f."""
+        left = functions.remaining()
+
+        if t is None and left is None:
+            return None
+
+        return min(x for x in (t, left) if x is not None)
+
+    def advice(f):
+        if iscoroutinefunction(f):
+
+            @wraps(f)
+            async def awrapped(*args, **kwargs):
+                seconds = budget()
+
+                if seconds is None:
+                    return await f(*args, **kwargs)
+                elif seconds <= 0:
+                    raise DeadlineError("The deadline has passed.")
+
+                try:
+                    return await asyncio.wait_for(f(*args, **kwargs), seconds)
+                except asyncio.TimeoutError:
+                    raise DeadlineError(
+                        "The call took more than {}s.".format(seconds)
+                    ) from None
+
+            return awrapped
+
+        @wraps(f)
+        def wrapped(*args, **kwargs):
+            seconds = budget()
+
+            if seconds is None:
+                return f(*args, **kwargs)
+
+            return functions.within(f, seconds, *args, **kwargs)
+
+        return wrapped
+
     return advice
 
 
@@ -177,6 +550,17 @@ def exceptional(x: Any = None, on: Type[Exception] = Exception) -> Advice:
     """Return x when f raises an exception."""
 
     def advice(f):
+        if iscoroutinefunction(f):
+
+            @wraps(f)
+            async def awrapped(*args, **kwargs):
+                try:
+                    return await f(*args, **kwargs)
+                except on:
+                    return x
+
+            return awrapped
+
         @wraps(f)
         def wrapped(*args, **kwargs):
             try:
@@ -186,34 +570,147 @@ def exceptional(x: Any = None, on: Type[Exception] = Exception) -> Advice:
 
         return wrapped
 
+    def error(e, _):
+        if isinstance(e, on):
+            return x
+
+        raise e
+
+    advice.hooks = lambda f: Hooks(error=error)
+
+    return advice
+
+
+# In[ ]:
+
+
+def profilable(
+    profile: Optional[Profile] = None, name: Optional[str] = None
+) -> Advice:
+    """Record the latency of f calls in profile (by name or qualname)."""
+    store = Profile() if profile is None else profile
+
+    def advice(f):
+        label = name or getattr(
+            f, "__qualname__", getattr(f, "__name__", type(f).__name__)
+        )
+        wrapped = timed(f, label, store)
+        wrapped.profile = store
+
+        return wrapped
+
     return advice
 
 
+# In[ ]:
+
+
+def emitter(logger: Any, level: int) -> Tuple[Callable, Callable]:
+    """Return the level check and the (lazy) emit function of a logger."""
+    if isinstance(logger, logging.Logger):
+        return partial(logger.isEnabledFor, level), partial(logger.log, level)
+
+    def enabled():
+        return True
+
+    def emit(message, *args):
+        logger(message % args)
+
+    return enabled, emit
+
+
+def sampler(enabled: Callable[[], bool], sample: int) -> Callable[[], bool]:
+    """Return a check that holds for one call in sample (if enabled)."""
+    calls = count()
+
+    def active():
+        return enabled() and (sample == 1 or next(calls) % sample == 0)
+
+    return active
+
+
 # In[4]:
 
 
 def loggable(
-    logger: Callable[[str], None] = logging.info,
+    logger: Union[logging.Logger, Callable[[str], None]] = logging.root,
     pre: bool = True,
     post: bool = True,
+    level: int = logging.INFO,
+    sample: int = 1,
 ) -> Advice:
-    """Log f before and/or after call."""
+    """Log f before and/or after one call in sample (if level is enabled)."""
+    enabled, emit = emitter(logger, level)
 
     def advice(f):
+        if not pre and not post:
+            return f
+
+        name = getattr(f, "__name__", repr(f))
+        active = sampler(enabled, sample)
+
+        if iscoroutinefunction(f):
+
+            @wraps(f)
+            async def awrapped(*args, **kwargs):
+                if not active():
+                    return await f(*args, **kwargs)
+
+                if pre:
+                    emit("enter: %s", name)
+
+                state = await f(*args, **kwargs)
+
+                if post:
+                    emit("exit: %s", name)
+
+                return state
+
+            return awrapped
+
         @wraps(f)
         def wrapped(*args, **kwargs):
+            if not active():
+                return f(*args, **kwargs)
+
             if pre:
-                logger("enter: {}".format(f.__name__))
+                emit("enter: %s", name)
 
             state = f(*args, **kwargs)
 
             if post:
-                logger("exit: {}".format(f.__name__))
+                emit("exit: %s", name)
 
             return state
 
         return wrapped
 
+    def hooks(f):
+        if not pre and not post:
+            return Hooks()
+
+        name = getattr(f, "__name__", repr(f))
+        active = sampler(enabled, sample)
+
+        def begin(args, kwargs):
+            if not active():
+                return False
+
+            if pre:
+                emit("enter: %s", name)
+
+            return True
+
+        def end(state, entered):
+            if entered and post:
+                emit("exit: %s", name)
+
+            return state
+
+        return Hooks(begin, end)
+
+    advice.hooks = hooks
+
     return advice
 
 
@@ -221,31 +718,99 @@ def loggable(
 
 
 def traceable(
-    printer: Callable[[str], None] = print,
+    printer: Union[logging.Logger, Callable[[str], None]] = print,
     pre: bool = True,
     post: bool = False,
+    level: int = logging.DEBUG,
+    sample: int = 1,
+    size: int = 80,
 ) -> Advice:
-    """Print f trace before and/or after call."""
+    """Print f trace before and/or after one call in sample (bounded)."""
+    enabled, emit = emitter(printer, level)
+    short = reprlib.Repr()
+    short.maxstring = short.maxother = size
+
+    def trace(name, args, kwargs):
+        strargs = [short.repr(x) for x in args]
+        strkwargs = [
+            "{0}={1}".format(k, short.repr(v)) for k, v in kwargs.items()
+        ]
+
+        return "{0}({1})".format(name, ",".join(strargs + strkwargs))
 
     def advice(f):
+        if not pre and not post:
+            return f
+
+        name = getattr(f, "__name__", repr(f))
+        active = sampler(enabled, sample)
+
+        if iscoroutinefunction(f):
+
+            @wraps(f)
+            async def awrapped(*args, **kwargs):
+                if not active():
+                    return await f(*args, **kwargs)
+
+                inittrace = trace(name, args, kwargs)
+
+                if pre:
+                    emit("[PRE] %s", inittrace)
+
+                state = await f(*args, **kwargs)
+
+                if post:
+                    emit("[POST] %s -> %s", inittrace, short.repr(state))
+
+                return state
+
+            return awrapped
+
         @wraps(f)
         def wrapped(*args, **kwargs):
-            strf = f.__name__
-            strargs = [str(x) for x in args]
-            strkwargs = ["{0}={1}".format(k, v) for k, v in kwargs.items()]
-            inittrace = "{0}({1})".format(strf, ",".join(strargs + strkwargs))
+            if not active():
+                return f(*args, **kwargs)
+
+            inittrace = trace(name, args, kwargs)
 
             if pre:
-                printer("[PRE] {}".format(inittrace))
+                emit("[PRE] %s", inittrace)
 
             state = f(*args, **kwargs)
-            exittrace = str(state)
 
             if post:
-                printer("[POST] {} -> {}".format(inittrace, exittrace))
+                emit("[POST] %s -> %s", inittrace, short.repr(state))
 
             return state
 
         return wrapped
 
+    def hooks(f):
+        if not pre and not post:
+            return Hooks()
+
+        name = getattr(f, "__name__", repr(f))
+        active = sampler(enabled, sample)
+
+        def begin(args, kwargs):
+            if not active():
+                return None
+
+            inittrace = trace(name, args, kwargs)
+
+            if pre:
+                emit("[PRE] %s", inittrace)
+
+            return inittrace
+
+        def end(state, inittrace):
+            if inittrace is not None and post:
+                emit("[POST] %s -> %s", inittrace, short.repr(state))
+
+            return state
+
+        return Hooks(begin, end)
+
+    advice.hooks = hooks
+
     return advice
@@ -0,0 +1,595 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+"""Caches of the project."""
+
+import os
+import sys
+import time
+import pickle
+import sqlite3
+import threading
+
+from collections import OrderedDict, defaultdict
+
+from typing import (
+    Any,
+    Tuple,
+    Mapping,
+    Hashable,
+    Callable,
+    NamedTuple,
+    Optional,
+)
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover
+    np = None
+
+from gampy.errors import DefinitionError
+from gampy.structures import digest
+
+
+# In[ ]:
+
+
+MISSING = object()  # returned by get when a key is not cached
+
+
+class Content:
+    """Mark the content digest of an unhashable argument."""
+
+
+class Keyed:
+    """A call keyed by the content of its arguments (for lru_cache)."""
+
+    __slots__ = ("key", "args", "kwargs")
+
+    def __init__(self, key: Hashable, args: Tuple, kwargs: Mapping) -> None:
+        """Initialize object."""
+        self.key = key
+        self.args = args
+        self.kwargs = kwargs
+
+    def __hash__(self) -> int:
+        """Hash the key of the call."""
+        return hash(self.key)
+
+    def __eq__(self, other) -> bool:
+        """Compare the keys of the calls."""
+        return isinstance(other, Keyed) and self.key == other.key
+
+
+def cachekey(
+    args: Tuple, kwargs: Mapping, typed: bool = False
+) -> Optional[Hashable]:
+    """Return the cache key of a call (or None if it cannot be cached)."""
+
+    def part(x):
+        try:
+            hash(x)
+        except TypeError:
+            return (Content, type(x), digest(x))  # raise without content
+
+        return (type(x), x) if typed else x
+
+    items = sorted(kwargs.items())
+
+    try:
+        return tuple(map(part, args)) + tuple((k, part(v)) for k, v in items)
+    except TypeError:  # an unhashable argument without content digest
+        return None
+
+
+def hashable(args: Tuple, kwargs: Mapping) -> bool:
+    """Return True if every argument of a call is hashable."""
+    try:
+        hash((args, tuple(kwargs.values())))
+    except TypeError:
+        return False
+
+    return True
+
+
+def sizeof(x: Any) -> int:
+    """Return the size of x in bytes (with the content of containers)."""
+    seen: set = set()
+    stack = [x]
+    size = 0
+
+    while stack:
+        x = stack.pop()
+
+        if id(x) in seen:
+            continue
+
+        seen.add(id(x))
+        size += sys.getsizeof(x)
+
+        if np is not None and isinstance(x, np.ndarray):
+            size += 0 if x.base is None else x.nbytes  # views
+        elif isinstance(x, Mapping):
+            stack.extend(x.keys())
+            stack.extend(x.values())
+        elif isinstance(x, (list, tuple, set, frozenset)):
+            stack.extend(x)
+
+    return size
+
+
+# In[ ]:
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    maxsize: Optional[int]
+    currsize: int
+    nbytes: int
+
+
+class Cache:
+    """A Cache keeps results with bounds on entries, bytes and age."""
+
+    POLICIES = ("lru", "lfu")
+
+    def __init__(
+        self,
+        n: Optional[int] = 128,
+        size: Optional[int] = None,
+        ttl: Optional[float] = None,
+        policy: str = "lru",
+        sizer: Callable[[Any], int] = sizeof,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize object (n entries, size bytes, ttl seconds)."""
+        if policy not in self.POLICIES:
+            raise DefinitionError(
+                "The cache policy should be lru or lfu. Not: {}.".format(
+                    policy
+                )
+            )
+
+        self.n = n
+        self.size = size
+        self.ttl = ttl
+        self.policy = policy
+        self.sizer = sizer
+        self.clock = clock
+        self.lock = threading.RLock()
+        self.entries: OrderedDict = OrderedDict()  # key: (value, bytes, end)
+        self.counts: dict = dict()  # key: number of uses (lfu)
+        self.buckets: defaultdict = defaultdict(OrderedDict)  # count: keys
+        self.least = 0  # least number of uses (lfu)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self.entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Return True if key is cached (and not expired)."""
+        with self.lock:
+            entry = self.entries.get(key)
+
+            return entry is not None and not self.expired(entry)
+
+    def expired(self, entry: Tuple) -> bool:
+        """Return True if the entry is too old."""
+        return entry[2] is not None and entry[2] <= self.clock()
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """Return the value of key (or default)."""
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is not None and self.expired(entry):
+                self.expirations += 1
+                self.delete(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+
+                return default
+
+            self.hits += 1
+            self.touch(key)
+
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache the value of key (evict other entries if needed)."""
+        nbytes = self.sizer(value) if self.size is not None else 0
+        end = None if self.ttl is None else self.clock() + self.ttl
+
+        if self.size is not None and nbytes > self.size:
+            return  # would evict every entry
+        elif self.n is not None and self.n <= 0:
+            return  # never store (like lru_cache(0))
+
+        with self.lock:
+            if key in self.entries:
+                self.delete(key)
+
+            while self.entries and self.full(nbytes):
+                self.evictions += 1
+                self.delete(self.victim())
+
+            self.entries[key] = (value, nbytes, end)
+            self.nbytes += nbytes
+            self.counts[key] = 1
+            self.buckets[1][key] = None
+            self.least = 1
+
+    def full(self, nbytes: int) -> bool:
+        """Return True if an entry of nbytes does not fit."""
+        if self.n is not None and len(self.entries) >= self.n:
+            return True
+
+        return self.size is not None and self.nbytes + nbytes > self.size
+
+    def touch(self, key: Hashable) -> None:
+        """Record a use of key."""
+        if self.policy == "lru":
+            self.entries.move_to_end(key)
+
+            return
+
+        count = self.counts[key]
+        bucket = self.buckets[count]
+        del bucket[key]
+
+        if not bucket:
+            del self.buckets[count]
+
+            if self.least == count:
+                self.least = count + 1
+
+        self.counts[key] = count + 1
+        self.buckets[count + 1][key] = None
+
+    def victim(self) -> Hashable:
+        """Return the key to evict first."""
+        if self.policy == "lru":
+            return next(iter(self.entries))
+
+        if self.least not in self.buckets:  # after a deletion
+            self.least = min(self.buckets)
+
+        return next(iter(self.buckets[self.least]))
+
+    def delete(self, key: Hashable) -> None:
+        """Remove the entry of key."""
+        _, nbytes, _ = self.entries.pop(key)
+        self.nbytes -= nbytes
+        count = self.counts.pop(key)
+        bucket = self.buckets[count]
+        del bucket[key]
+
+        if not bucket:
+            del self.buckets[count]
+
+    def clear(self) -> None:
+        """Remove every entry (and reset statistics)."""
+        with self.lock:
+            self.entries.clear()
+            self.counts.clear()
+            self.buckets.clear()
+            self.least = 0
+            self.nbytes = 0
+            self.hits = self.misses = 0
+            self.evictions = self.expirations = 0
+
+    def info(self) -> CacheInfo:
+        """Return the cache statistics."""
+        with self.lock:
+            return CacheInfo(
+                self.hits,
+                self.misses,
+                self.evictions,
+                self.expirations,
+                self.n,
+                len(self.entries),
+                self.nbytes,
+            )
+
+
+# In[ ]:
+
+
+class DiskCache:
+    """A DiskCache keeps results in a SQLite file (shared by processes)."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cache (
+            space TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value BLOB NOT NULL,
+            nbytes INTEGER NOT NULL,
+            used REAL NOT NULL,
+            hits INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (space, key)
+        );
+        CREATE INDEX IF NOT EXISTS cache_used ON cache (used);
+        CREATE TABLE IF NOT EXISTS total (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            nbytes INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO total SELECT 0, COALESCE(SUM(nbytes), 0)
+            FROM cache;
+        CREATE TRIGGER IF NOT EXISTS cache_insert AFTER INSERT ON cache
+            BEGIN UPDATE total SET nbytes = nbytes + NEW.nbytes; END;
+        CREATE TRIGGER IF NOT EXISTS cache_update AFTER UPDATE OF nbytes
+            ON cache BEGIN
+                UPDATE total SET nbytes = nbytes - OLD.nbytes + NEW.nbytes;
+            END;
+        CREATE TRIGGER IF NOT EXISTS cache_delete AFTER DELETE ON cache
+            BEGIN UPDATE total SET nbytes = nbytes - OLD.nbytes; END;
+    """
+
+    FLUSH = 64  # uses of hot entries written at once
+
+    def __init__(
+        self,
+        path: str,
+        size: Optional[int] = None,
+        dumps: Callable[[Any], bytes] = pickle.dumps,
+        loads: Callable[[bytes], Any] = pickle.loads,
+        warm: int = 0,
+        space: str = "",
+        timeout: float = 30.0,
+    ) -> None:
+        """Initialize object (size bytes in the file, warm hot entries)."""
+        self.path = path
+        self.size = size
+        self.dumps = dumps
+        self.loads = loads
+        self.space = space
+        self.timeout = timeout
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.hot: dict = dict()  # preloaded entries
+        self.uses: dict = dict()  # hot key: uses not written yet
+        self.unwritten = 0  # number of uses not written yet
+        self.last = 0.0  # time of the last use
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.connect().executescript(
+            "BEGIN IMMEDIATE;{}COMMIT;".format(self.SCHEMA)
+        )
+
+        if warm:
+            self.warm(warm)
+
+    def connect(self) -> sqlite3.Connection:
+        """Return the connection of the current thread and process."""
+        db = getattr(self.local, "db", None)
+
+        if db is None or self.local.pid != os.getpid():
+            db = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            db.execute("PRAGMA journal_mode=WAL")  # readers never block
+            db.execute("PRAGMA synchronous=NORMAL")
+            self.local.db = db
+            self.local.pid = os.getpid()
+
+        return db
+
+    def close(self) -> None:
+        """Close the connection of the current thread."""
+        self.flush()
+        db = getattr(self.local, "db", None)
+
+        if db is not None:
+            db.close()
+            self.local.db = None
+
+    def keyof(self, key: Hashable) -> Optional[str]:
+        """Return the persistent form of a key (or None if it has none)."""
+        if isinstance(key, str):
+            return key
+
+        try:
+            return digest(key)  # by content (stable across processes)
+        except TypeError:
+            return None
+
+    def now(self) -> float:
+        """Return the current time (strictly increasing in a process)."""
+        with self.lock:
+            self.last = max(time.time(), self.last + 1e-6)
+
+            return self.last
+
+    def count(self, name: str) -> None:
+        """Increment a statistic of the current process."""
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def flush(self) -> None:
+        """Write the uses of hot entries (for eviction and warming)."""
+        with self.lock:
+            uses, self.uses = self.uses, dict()
+            self.unwritten = 0
+
+        if uses:
+            now = self.now()
+            self.connect().executemany(
+                "UPDATE cache SET used = ?, hits = hits + ?"
+                " WHERE space = ? AND key = ?",
+                [(now, n, self.space, key) for key, n in uses.items()],
+            )
+
+    def warm(self, n: int) -> None:
+        """Preload the n most used entries in memory."""
+        self.flush()
+        rows = self.connect().execute(
+            "SELECT key, value FROM cache WHERE space = ?"
+            " ORDER BY hits DESC LIMIT ?",
+            (self.space, n),
+        )
+
+        self.hot = {key: self.loads(value) for key, value in rows}
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Return True if key is cached."""
+        key = self.keyof(key)
+
+        if key is None:
+            return False
+
+        row = self.connect().execute(
+            "SELECT 1 FROM cache WHERE space = ? AND key = ?",
+            (self.space, key),
+        )
+
+        return key in self.hot or row.fetchone() is not None
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """Return the value of key (or default)."""
+        key = self.keyof(key)
+
+        if key is None:
+            self.count("misses")
+
+            return default
+
+        if key in self.hot:
+            with self.lock:
+                self.hits += 1
+                self.uses[key] = self.uses.get(key, 0) + 1
+                self.unwritten += 1
+                flush = self.unwritten >= self.FLUSH
+
+            if flush:
+                self.flush()
+
+            return self.hot[key]
+
+        db = self.connect()
+        row = db.execute(
+            "SELECT value FROM cache WHERE space = ? AND key = ?",
+            (self.space, key),
+        ).fetchone()
+
+        if row is None:
+            self.count("misses")
+
+            return default
+
+        db.execute(
+            "UPDATE cache SET used = ?, hits = hits + 1"
+            " WHERE space = ? AND key = ?",
+            (self.now(), self.space, key),
+        )
+        self.count("hits")
+
+        return self.loads(row[0])
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache the value of key (evict the least recently used if needed)."""
+        key = self.keyof(key)
+
+        if key is None:
+            return  # no persistent key
+
+        blob = self.dumps(value)
+
+        if self.size is not None and len(blob) > self.size:
+            return  # would evict every entry
+
+        if self.size is not None:
+            self.flush()  # evict by the latest uses
+
+        db = self.connect()
+        db.execute("BEGIN IMMEDIATE")  # one writer at a time
+
+        try:
+            db.execute(
+                "INSERT INTO cache VALUES (?, ?, ?, ?, ?, 0)"
+                " ON CONFLICT (space, key) DO UPDATE SET"
+                " value = excluded.value, nbytes = excluded.nbytes,"
+                " used = excluded.used, hits = 0",
+                (self.space, key, blob, len(blob), self.now()),
+            )
+
+            if self.size is not None:
+                self.evict(db)
+
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def evict(self, db: sqlite3.Connection) -> None:
+        """Remove the least recently used entries beyond size bytes."""
+        (total,) = db.execute("SELECT nbytes FROM total").fetchone()
+
+        while total > self.size:
+            rows = db.execute(
+                "SELECT space, key, nbytes FROM cache ORDER BY used LIMIT 64"
+            ).fetchall()
+
+            if not rows:
+                break
+
+            for space, key, nbytes in rows:
+                if total <= self.size:
+                    break
+
+                db.execute(
+                    "DELETE FROM cache WHERE space = ? AND key = ?",
+                    (space, key),
+                )
+                total -= nbytes
+                self.count("evictions")
+
+    def clear(self) -> None:
+        """Remove every entry of the space (and reset statistics)."""
+        self.connect().execute(
+            "DELETE FROM cache WHERE space = ?", (self.space,)
+        )
+        self.hot.clear()
+
+        with self.lock:
+            self.uses.clear()
+            self.unwritten = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        """Return the cache statistics (of the current process)."""
+        currsize, nbytes = (
+            self.connect()
+            .execute(
+                "SELECT COUNT(*), SUM(nbytes) FROM cache WHERE space = ?",
+                (self.space,),
+            )
+            .fetchone()
+        )
+
+        with self.lock:
+            return CacheInfo(
+                self.hits,
+                self.misses,
+                self.evictions,
+                0,
+                None,
+                currsize,
+                nbytes or 0,
+            )
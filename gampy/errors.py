@@ -17,3 +17,7 @@ class DefinitionError(Error):
 
 class CompositionError(Error):
     """Error during composition."""
+
+
+class DeadlineError(Error, TimeoutError):
+    """Error when the time budget runs out."""
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+"""Events of the project."""
+
+import os
+import json
+import asyncio
+import threading
+
+from time import perf_counter_ns
+from collections import deque
+from inspect import iscoroutinefunction
+from functools import wraps
+
+from typing import Any, Dict, List, Deque, Tuple, Callable, NamedTuple
+
+from gampy.errors import DefinitionError
+
+
+# In[ ]:
+
+
+START, END, ERROR = "start", "end", "error"
+KINDS = (START, END, ERROR)
+
+SPEEDSCOPE = "https://www.speedscope.app/file-format-schema.json"
+
+
+class Event(NamedTuple):
+    """An Event marks the start, the end or the error of a step call."""
+
+    kind: str
+    name: str
+    time: int  # perf_counter_ns
+    lane: int  # thread (or asyncio task) of the call
+    error: Any = None
+
+
+# In[ ]:
+
+
+class Events:
+    """Events dispatches the events of steps to their subscribers."""
+
+    def __init__(self) -> None:
+        """Initialize object."""
+        self.lock = threading.Lock()
+        self.active = False  # True if a callback is subscribed
+        self.subscribers: Dict[str, Tuple[Callable, ...]] = {
+            k: () for k in KINDS
+        }
+
+    def __bool__(self) -> bool:
+        """Return True if a callback is subscribed."""
+        return self.active
+
+    def subscribe(self, callback: Callable, *kinds: str) -> Callable:
+        """Call back on events of these kinds (default: every kind)."""
+        for kind in kinds:
+            if kind not in KINDS:
+                raise DefinitionError(
+                    "The event kind should be in {}. Not: {}.".format(
+                        KINDS, kind
+                    )
+                )
+
+        with self.lock:
+            for kind in kinds or KINDS:
+                self.subscribers[kind] += (callback,)
+
+            self.active = True
+
+        return callback
+
+    def unsubscribe(self, callback: Callable, *kinds: str) -> None:
+        """Stop calling back on events of these kinds (default: every kind)."""
+        with self.lock:
+            for kind in kinds or KINDS:
+                self.subscribers[kind] = tuple(
+                    c for c in self.subscribers[kind] if c != callback
+                )
+
+            self.active = any(self.subscribers.values())
+
+    def emit(self, kind: str, name: str, lane: int, error: Any = None) -> None:
+        """Call back the subscribers of kind (if any) with a new event."""
+        callbacks = self.subscribers[kind]
+
+        if callbacks:
+            event = Event(kind, name, perf_counter_ns(), lane, error)
+
+            for callback in callbacks:
+                callback(event)
+
+
+# In[ ]:
+
+
+class Recorder:
+    """A Recorder keeps the last events in a ring buffer (for traces)."""
+
+    def __init__(self, size: int = 65536) -> None:
+        """Initialize object."""
+        self.events: Deque[Event] = deque(maxlen=size)
+
+    def __call__(self, event: Event) -> None:
+        """Record an event (the error is kept as its repr)."""
+        if event.error is not None:
+            event = event._replace(error=repr(event.error))
+
+        self.events.append(event)
+
+    def clear(self) -> None:
+        """Remove every event."""
+        self.events.clear()
+
+    def balanced(self) -> List[Event]:
+        """Return the events with a start and an end in each lane."""
+        events = list(self.events)
+        stacks: Dict[int, List[str]] = dict()
+        balanced = list()
+
+        for event in events:
+            stack = stacks.setdefault(event.lane, [])
+
+            if event.kind == START:
+                stack.append(event.name)
+                balanced.append(event)
+            elif stack and stack[-1] == event.name:
+                stack.pop()
+                balanced.append(event)
+            # else: the start was dropped from the ring buffer
+
+        last = events[-1].time if events else 0
+
+        for lane, stack in stacks.items():  # calls still running
+            for name in reversed(stack):
+                balanced.append(Event(END, name, last, lane))
+
+        return balanced
+
+    def chrome(self) -> str:
+        """Return the events in the Chrome trace-event JSON format."""
+        pid = os.getpid()
+        trace = list()
+
+        for event in self.balanced():
+            entry = {
+                "name": event.name,
+                "ph": "B" if event.kind == START else "E",
+                "ts": event.time / 1e3,  # microseconds
+                "pid": pid,
+                "tid": event.lane,
+            }
+
+            if event.kind == ERROR:
+                entry["args"] = {"error": event.error}
+
+            trace.append(entry)
+
+        return json.dumps({"traceEvents": trace, "displayTimeUnit": "ms"})
+
+    def speedscope(self) -> str:
+        """Return the events in the speedscope JSON format."""
+        frames: Dict[str, int] = dict()
+        lanes: Dict[int, List[dict]] = dict()
+
+        for event in self.balanced():
+            lanes.setdefault(event.lane, []).append(
+                {
+                    "type": "O" if event.kind == START else "C",
+                    "frame": frames.setdefault(event.name, len(frames)),
+                    "at": event.time,
+                }
+            )
+
+        profiles = [
+            {
+                "type": "evented",
+                "name": "lane {}".format(lane),
+                "unit": "nanoseconds",
+                "startValue": events[0]["at"],
+                "endValue": events[-1]["at"],
+                "events": events,
+            }
+            for lane, events in lanes.items()
+        ]
+        document = {
+            "$schema": SPEEDSCOPE,
+            "shared": {"frames": [{"name": name} for name in frames]},
+            "profiles": profiles,
+            "name": "gampy",
+            "exporter": "gampy",
+        }
+
+        return json.dumps(document)
+
+
+# In[ ]:
+
+
+def emitting(f: Callable, name: str, events: Events) -> Callable:
+    """Return f emitting the start, the end and the error of its calls."""
+    emit = events.emit
+
+    if iscoroutinefunction(f):
+
+        @wraps(f)
+        async def awrapped(*args, **kwargs):
+            lane = id(asyncio.current_task())
+            emit(START, name, lane)
+
+            try:
+                state = await f(*args, **kwargs)
+            except Exception as error:
+                emit(ERROR, name, lane, error)
+                raise
+
+            emit(END, name, lane)
+
+            return state
+
+        return awrapped
+
+    @wraps(f)
+    def wrapped(*args, **kwargs):
+        lane = threading.get_ident()
+        emit(START, name, lane)
+
+        try:
+            state = f(*args, **kwargs)
+        except Exception as error:
+            emit(ERROR, name, lane, error)
+            raise
+
+        emit(END, name, lane)
+
+        return state
+
+    return wrapped
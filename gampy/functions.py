@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+"""Functions of the project."""
+
+import os
+import time
+import threading
+
+from queue import Queue, Full, Empty
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from collections import deque
+from itertools import islice
+from concurrent.futures import (
+    wait,
+    Future,
+    Executor,
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    ProcessPoolExecutor,
+    TimeoutError as FutureTimeoutError,
+)
+
+from typing import (
+    Any,
+    List,
+    NamedTuple,
+    Tuple,
+    Sized,
+    Sequence,
+    Iterable,
+    Iterator,
+    Callable,
+    Optional,
+)
+
+from gampy.errors import DeadlineError
+
+
+# In[ ]:
+
+
+def take(n: int, iterable: Iterable) -> Iterator:
+    """Take the first n items of iterable."""
+    return islice(iterable, n)
+
+
+# In[ ]:
+
+
+def chunkmap(f: Callable, chunk: List) -> Tuple[List, float]:
+    """Map f over a chunk (and measure its duration)."""
+    start = time.perf_counter()
+    results = [f(x) for x in chunk]
+
+    return results, time.perf_counter() - start
+
+
+def pmap(
+    f: Callable,
+    iterable: Iterable,
+    workers: Optional[int] = None,
+    processes: bool = False,
+    chunksize: Optional[int] = None,
+    ordered: bool = True,
+    inflight: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> Iterator:
+    """Map f over iterable with a pool of threads or processes."""
+    workers = workers or os.cpu_count() or 1
+    inflight = inflight or 2 * workers
+    size = chunksize or 1
+
+    if chunksize is None and isinstance(iterable, Sized):
+        size = max(1, len(iterable) // (4 * workers))
+
+    if executor is not None:
+        pool = executor
+    elif processes:
+        pool = ProcessPoolExecutor(workers)
+    else:
+        pool = ThreadPoolExecutor(workers)
+
+    items = iter(iterable)
+    pending: deque = deque()
+
+    try:
+        while True:
+            while len(pending) < inflight:
+                chunk = list(islice(items, size))
+
+                if not chunk:
+                    break
+
+                pending.append(pool.submit(chunkmap, f, chunk))
+
+            if not pending:
+                return
+            elif ordered:
+                done: Any = [pending.popleft()]
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                pending = deque(p for p in pending if p not in done)
+
+            for future in done:
+                results, seconds = future.result()
+
+                if chunksize is None and seconds < 0.01:
+                    size = min(2 * size, 1024)
+
+                yield from results
+    finally:
+        for future in pending:
+            future.cancel()
+
+        if executor is None:
+            pool.shutdown()
+
+
+# In[ ]:
+
+
+class Failure(NamedTuple):
+    """Error raised by a stage (and sent downstream)."""
+
+    error: Exception
+
+
+DONE = object()  # end of the items
+
+
+def pipelined(
+    functions: Sequence[Callable],
+    iterable: Iterable,
+    maxsize: int = 1,
+    prefetch: int = 1,
+) -> Iterator:
+    """Apply functions to each item with one thread and queue per function."""
+    stop = threading.Event()
+    queues: List[Queue] = [Queue(prefetch)]
+    queues.extend(Queue(maxsize) for _ in functions)
+
+    def put(q, x):
+        while not stop.is_set():
+            try:
+                return q.put(x, timeout=0.1)
+            except Full:
+                pass
+
+    def get(q):
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except Empty:
+                pass
+
+        return DONE
+
+    def source():
+        try:
+            for x in iterable:
+                if stop.is_set():
+                    return
+
+                put(queues[0], x)
+        except Exception as error:  # pylint: disable=broad-except
+            return put(queues[0], Failure(error))
+
+        put(queues[0], DONE)
+
+    def stage(f, inq, outq):
+        while True:
+            x = get(inq)
+
+            if x is DONE or isinstance(x, Failure):
+                return put(outq, x)
+
+            try:
+                put(outq, f(x))
+            except Exception as error:  # pylint: disable=broad-except
+                return put(outq, Failure(error))
+
+    threads = [threading.Thread(target=source, daemon=True)]
+    threads.extend(
+        threading.Thread(target=stage, args=(f, inq, outq), daemon=True)
+        for f, inq, outq in zip(functions, queues, queues[1:])
+    )
+
+    for t in threads:
+        t.start()
+
+    try:
+        while True:
+            x = get(queues[-1])
+
+            if x is DONE:
+                return
+            elif isinstance(x, Failure):
+                raise x.error
+
+            yield x
+    finally:
+        stop.set()
+
+        for t in threads:
+            t.join()
+
+
+# In[ ]:
+
+
+# DEADLINES
+
+DEADLINE: ContextVar = ContextVar("deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[float]:
+    """Limit the duration of calls in the context (limits only shrink)."""
+    end = time.monotonic() + seconds
+    current = DEADLINE.get()
+    token = DEADLINE.set(end if current is None else min(current, end))
+
+    try:
+        yield end
+    finally:
+        DEADLINE.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Return the seconds left before the deadline (None if unlimited)."""
+    end = DEADLINE.get()
+
+    return None if end is None else end - time.monotonic()
+
+
+def check() -> None:
+    """Raise a DeadlineError if the deadline has passed."""
+    left = remaining()
+
+    if left is not None and left <= 0:
+        raise DeadlineError("The deadline has passed.")
+
+
+def within(f: Callable, seconds: float, *args, **kwargs) -> Any:
+    """Call f in a thread and wait for its result at most seconds."""
+    if seconds <= 0:
+        raise DeadlineError("The deadline has passed.")
+
+    future: Future = Future()
+    context = copy_context()  # f sees the same deadline
+
+    def run():
+        try:
+            future.set_result(context.run(f, *args, **kwargs))
+        except BaseException as error:  # pylint: disable=broad-except
+            future.set_exception(error)
+
+    threading.Thread(target=run, daemon=True).start()
+
+    try:
+        return future.result(seconds)
+    except TimeoutError:
+        if future.done():  # raised by f
+            raise
+    except FutureTimeoutError:  # before python 3.11
+        pass
+
+    raise DeadlineError("The call took more than {}s.".format(seconds))
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+"""Hooks of the project."""
+
+import time
+import asyncio
+import builtins
+import linecache
+
+from types import CodeType, FunctionType
+from inspect import iscoroutinefunction
+from itertools import chain
+from functools import lru_cache, update_wrapper
+
+from typing import Any, Tuple, Callable, Optional, Sequence, NamedTuple
+
+
+# In[ ]:
+
+
+class Hooks(NamedTuple):
+    """Synchronous hooks of an advice (merged in a single wrapper)."""
+
+    # args, kwargs -> token (passed to post and error)
+    pre: Optional[Callable[[tuple, dict], Any]] = None
+    # state, token -> state
+    post: Optional[Callable[[Any, Any], Any]] = None
+    # exception, token -> state (or raise)
+    error: Optional[Callable[[Exception, Any], Any]] = None
+    # exception, try -> seconds to wait before a new try (or None)
+    retry: Optional[Callable[[Exception, int], Optional[float]]] = None
+
+
+@lru_cache(maxsize=1024)
+def template(
+    shape: Tuple[Tuple[bool, ...], ...], asynchronous: bool
+) -> CodeType:
+    """Return the code of a wrapper for layers of hooks (outermost first)."""
+    wait = "await " if asynchronous else ""
+    lines = ["{}def wrapped(*args, **kwargs):".format(wait and "async ")]
+    stack: list = list()
+    depth = 1
+
+    def emit(depth, line):
+        lines.append("    " * depth + line)
+
+    for k, (pre, post, error, retry) in enumerate(shape):
+        stack.append((k, depth))
+
+        if retry:
+            emit(depth, "i{} = 0".format(k))
+            emit(depth, "while True:")
+            depth += 1
+
+        if pre:
+            emit(depth, "t{0} = pre{0}(args, kwargs)".format(k))
+
+        if retry or error:
+            emit(depth, "try:")
+            depth += 1
+
+    emit(depth, "state = {}f(*args, **kwargs)".format(wait))
+
+    for k, depth in reversed(stack):
+        pre, post, error, retry = shape[k]
+        token = "t{}".format(k) if pre else "None"
+        handle = "state = error{}(e, {})".format(k, token)
+
+        if retry:
+            emit(depth + 2, "break")
+            emit(depth + 1, "except Exception as e:")
+            emit(depth + 2, "delay = retry{0}(e, i{0})".format(k))
+            emit(depth + 2, "if delay is None:")
+            emit(depth + 3, handle if error else "raise")
+            emit(depth + 3, "break")
+            emit(depth + 2, "i{} += 1".format(k))
+            emit(depth + 2, "{}sleep(delay)".format(wait))
+        elif error:
+            emit(depth, "except Exception as e:")
+            emit(depth + 1, handle)
+
+        if post:
+            emit(depth, "state = post{}(state, {})".format(k, token))
+
+    emit(1, "return state")
+    source = "\n".join(lines)
+    filename = "<hooked-{}>".format(abs(hash(source)))
+    lines = source.splitlines(True)
+    linecache.cache[filename] = (len(source), None, lines, filename)
+    module = compile(source, filename, "exec")
+
+    return next(c for c in module.co_consts if isinstance(c, CodeType))
+
+
+@lru_cache(maxsize=None)
+def names(n: int) -> Tuple[str, ...]:
+    """Return the global names of the hooks of n layers in a wrapper."""
+    return tuple("{}{}".format(h, k) for k in range(n) for h in Hooks._fields)
+
+
+def hooked(f: Callable, layers: Sequence[Hooks]) -> Callable:
+    """Return f with layers of hooks (innermost first) in a single frame."""
+    asynchronous = iscoroutinefunction(f)
+    layers = layers[::-1]  # outermost first
+    shape = tuple(tuple(h is not None for h in hooks) for hooks in layers)
+    scope = dict(zip(names(len(layers)), chain.from_iterable(layers)))
+    scope["__builtins__"] = builtins  # not implied before Python 3.10
+    scope["f"] = f
+    scope["sleep"] = asyncio.sleep if asynchronous else time.sleep
+    code = template(shape, asynchronous)  # compiled once per shape
+
+    return update_wrapper(FunctionType(code, scope), f)
+
+
+def advicename(advice: Callable) -> str:
+    """Return the name of the function that made advice (e.g. cacheable)."""
+    name = getattr(advice, "__qualname__", type(advice).__name__)
+
+    return name.split(".<locals>")[0]
+
+
+def fused(*advices: Callable) -> Callable:
+    """Apply advices in order (with one wrapper per run of hooks)."""
+
+    def advice(f):
+        layers: list = list()
+
+        for a in advices:
+            hooks = getattr(a, "hooks", None)
+            layer = hooks(f) if hooks is not None else None
+
+            if layer is not None:
+                if any(layer):  # or skip an identical advice
+                    layers.append(layer)
+
+                continue
+
+            if layers:
+                f = hooked(f, layers)
+                layers = []
+
+            f = a(f)
+
+        return hooked(f, layers) if layers else f
+
+    return advice
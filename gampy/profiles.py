@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+"""Profiles of the project."""
+
+import threading
+
+from time import perf_counter_ns
+from inspect import iscoroutinefunction
+from functools import wraps
+from contextvars import ContextVar
+
+from typing import Any, Dict, List, Callable, Optional
+
+
+# In[ ]:
+
+
+PRECISION = 5  # significant bits of a histogram bucket (~3% error)
+QUANTILES = (0.5, 0.95, 0.99)
+
+FRAME: ContextVar[Optional[List[int]]] = ContextVar("FRAME", default=None)
+
+
+def middle(lower: int) -> float:
+    """Return the middle of the histogram bucket starting at lower."""
+    shift = lower.bit_length() - PRECISION
+
+    return lower if shift <= 0 else lower + (1 << shift) / 2
+
+
+# In[ ]:
+
+
+class Record:
+    """A Record accumulates the latencies of a step (in nanoseconds)."""
+
+    __slots__ = ("lock", "calls", "total", "own", "max", "buckets")
+
+    def __init__(self) -> None:
+        """Initialize object."""
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.total = 0
+        self.own = 0  # without the time of profiled callees
+        self.max = 0
+        self.buckets: Dict[int, int] = dict()  # lower bound: count
+
+    def add(self, elapsed: int, own: int) -> None:
+        """Record a call of elapsed nanoseconds."""
+        shift = elapsed.bit_length() - PRECISION  # histogram bucket
+        key = elapsed if shift <= 0 else elapsed >> shift << shift
+
+        with self.lock:
+            self.calls += 1
+            self.total += elapsed
+            self.own += own
+
+            if elapsed > self.max:
+                self.max = elapsed
+
+            self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def quantile(self, q: float) -> float:
+        """Return the q quantile of latencies (in nanoseconds)."""
+        rank = q * self.calls
+        seen = 0
+
+        for lower, n in sorted(self.buckets.items()):
+            seen += n
+
+            if seen >= rank:
+                return min(middle(lower), self.max)
+
+        return self.max
+
+
+# In[ ]:
+
+
+class Profile:
+    """A Profile keeps the latency records of steps by name."""
+
+    def __init__(self) -> None:
+        """Initialize object."""
+        self.lock = threading.Lock()
+        self.records: Dict[str, Record] = dict()
+
+    def recorder(self, name: str) -> Callable[[int, int], None]:
+        """Return the function that records a call of name."""
+        with self.lock:
+            return self.records.setdefault(name, Record()).add
+
+    def clear(self) -> None:
+        """Remove every record."""
+        with self.lock:
+            for record in self.records.values():
+                with record.lock:
+                    record.calls = record.total = record.own = record.max = 0
+                    record.buckets.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the statistics of each step (by decreasing self time)."""
+        stats: dict = dict()
+
+        with self.lock:
+            records = sorted(self.records.items(), key=lambda x: -x[1].own)
+
+        for name, record in records:
+            with record.lock:
+                if not record.calls:
+                    continue
+
+                stats[name] = {
+                    "calls": record.calls,
+                    "total": record.total / 1e9,
+                    "self": record.own / 1e9,
+                    "mean": record.total / record.calls / 1e9,
+                    "max": record.max / 1e9,
+                }
+
+                for q in QUANTILES:
+                    key = "p{:g}".format(q * 100)
+                    stats[name][key] = record.quantile(q) / 1e9
+
+        return stats
+
+    def prometheus(self, prefix: str = "gampy_step") -> str:
+        """Return the statistics in the Prometheus text format."""
+        lines = [
+            "# HELP {}_seconds Latency of the pipeline steps.".format(prefix),
+            "# TYPE {}_seconds summary".format(prefix),
+        ]
+        owns = [
+            "# HELP {}_self_seconds_total Time spent in the steps "
+            "(without profiled callees).".format(prefix),
+            "# TYPE {}_self_seconds_total counter".format(prefix),
+        ]
+
+        for name, stat in self.stats().items():
+            label = name.replace("\\", r"\\").replace('"', r"\"")
+            label = 'step="{}"'.format(label.replace("\n", r"\n"))
+
+            for q in QUANTILES:
+                key = "p{:g}".format(q * 100)
+                lines.append(
+                    '{}_seconds{{{},quantile="{:g}"}} {!r}'.format(
+                        prefix, label, q, stat[key]
+                    )
+                )
+
+            lines.append(
+                "{}_seconds_sum{{{}}} {!r}".format(
+                    prefix, label, stat["total"]
+                )
+            )
+            lines.append(
+                "{}_seconds_count{{{}}} {}".format(
+                    prefix, label, stat["calls"]
+                )
+            )
+            owns.append(
+                "{}_self_seconds_total{{{}}} {!r}".format(
+                    prefix, label, stat["self"]
+                )
+            )
+
+        return "\n".join(lines + owns) + "\n"
+
+
+# In[ ]:
+
+
+def timed(f: Callable, name: str, profile: Profile) -> Callable:
+    """Return f recording the latency of its calls in profile."""
+    add = profile.recorder(name)
+
+    if iscoroutinefunction(f):
+
+        @wraps(f)
+        async def awrapped(*args, **kwargs):
+            frame = [0]  # time of profiled callees
+            token = FRAME.set(frame)
+            start = perf_counter_ns()
+
+            try:
+                return await f(*args, **kwargs)
+            finally:
+                elapsed = perf_counter_ns() - start
+                FRAME.reset(token)
+                parent = FRAME.get()
+
+                if parent is not None:
+                    parent[0] += elapsed
+
+                add(elapsed, max(elapsed - frame[0], 0))
+
+        return awrapped
+
+    @wraps(f)
+    def wrapped(*args, **kwargs):
+        frame = [0]  # time of profiled callees
+        token = FRAME.set(frame)
+        start = perf_counter_ns()
+
+        try:
+            return f(*args, **kwargs)
+        finally:
+            elapsed = perf_counter_ns() - start
+            FRAME.reset(token)
+            parent = FRAME.get()
+
+            if parent is not None:
+                parent[0] += elapsed
+
+            add(elapsed, max(elapsed - frame[0], 0))
+
+    return wrapped
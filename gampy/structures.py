@@ -6,12 +6,60 @@
 
 """Structures of the project."""
 
-from functools import reduce, partial
-from itertools import chain, zip_longest
-
-from typing import Union, Tuple, Mapping, Sequence, Iterable, Callable
+import sys
+import pickle
+import linecache
+import threading
+
+from hashlib import blake2b
+from types import (
+    CodeType,
+    MethodType,
+    FunctionType,
+    GeneratorType,
+    CoroutineType,
+    MappingProxyType,
+    AsyncGeneratorType,
+)
+from inspect import ismodule, isawaitable
+from keyword import iskeyword
+from weakref import WeakValueDictionary
+from copy import deepcopy
+from operator import is_
+from functools import reduce, partial, lru_cache
+from itertools import (
+    chain,
+    repeat,
+    starmap,
+    dropwhile,
+    takewhile,
+    filterfalse,
+    zip_longest,
+)
+
+from typing import (
+    Any,
+    Union,
+    Tuple,
+    Mapping,
+    Hashable,
+    Sequence,
+    Iterable,
+    Callable,
+    Iterator,
+    Optional,
+)
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover
+    np = None
 
 from gampy.errors import DefinitionError, CompositionError
+from gampy.hooks import fused, advicename
+from gampy.functions import take, check, deadline, pipelined
+from gampy.events import Events, emitting
+from gampy.profiles import Profile, timed
 
 
 # In[13]:
@@ -23,11 +71,841 @@ Args = Sequence
 Kwargs = Mapping
 Function = Callable
 
-Step = Tuple[Function, Args, Kwargs]
 Advice = Callable[[Function], Function]
 PartialStep = Union[Function, Sequence]
 
 
+# In[ ]:
+
+
+class EmptyArgs(list):
+    """An EmptyArgs is an immutable empty list (shared by steps)."""
+
+    def forbid(self, *args, **kwargs):
+        """Forbid any change of the shared object."""
+        raise TypeError("Cannot change the shared empty arguments.")
+
+    append = extend = insert = remove = pop = clear = forbid
+    sort = reverse = __setitem__ = __delitem__ = __iadd__ = __imul__ = forbid
+
+
+class EmptyKwargs(dict):
+    """An EmptyKwargs is an immutable empty dict (shared by steps)."""
+
+    def forbid(self, *args, **kwargs):
+        """Forbid any change of the shared object."""
+        raise TypeError("Cannot change the shared empty keyword arguments.")
+
+    update = setdefault = pop = popitem = clear = forbid
+    __setitem__ = __delitem__ = __ior__ = forbid
+
+
+ARGS = EmptyArgs()
+KWARGS = EmptyKwargs()
+
+
+class Step:
+    """A Step is a function with its arguments (unpacked as a 3-tuple)."""
+
+    __slots__ = (
+        "_f",
+        "_args",
+        "_kwargs",
+        "_partial",
+        "_name",
+        "_key",
+        "_digest",
+        "_content",
+    )
+
+    def __init__(
+        self, f: Function, args: Args = ARGS, kwargs: Kwargs = KWARGS
+    ) -> None:
+        """Initialize object (empty arguments are shared)."""
+        self._f = f
+        self._args = ARGS if type(args) is list and not args else args
+        self._kwargs = (
+            KWARGS if type(kwargs) is dict and not kwargs else kwargs
+        )
+        self._partial: Optional[Callable] = None
+        self._name: Optional[str] = None
+        self._key: Optional[Hashable] = None
+        self._digest: Optional[int] = None
+        self._content: Optional[int] = None
+
+    def __reduce__(self) -> tuple:
+        """Pickle the step without its cached data."""
+        return (Step, (self._f, self._args, self._kwargs))
+
+    @property
+    def f(self) -> Function:
+        """Get the step function (read-only)."""
+        return self._f
+
+    @property
+    def args(self) -> Args:
+        """Get the step arguments (read-only)."""
+        return self._args
+
+    @property
+    def kwargs(self) -> Kwargs:
+        """Get the step keyword arguments (read-only)."""
+        return self._kwargs
+
+    @property
+    def partial(self) -> Callable:
+        """Get the function with its arguments applied (cached)."""
+        if self._partial is None:
+            self._partial = partial(self.f, *self.args, **self.kwargs)
+
+        return self._partial
+
+    @property
+    def name(self) -> str:
+        """Get the name of the step function (cached)."""
+        if self._name is None:
+            f = self.f
+            self._name = getattr(f, "__name__", type(f).__name__)
+
+        return self._name
+
+    @property
+    def key(self) -> Hashable:
+        """Get the hash key of the step (cached)."""
+        if self._key is None:
+            self._key = hashkey((self.f, self.args, self.kwargs))
+
+        return self._key
+
+    @property
+    def digest(self) -> int:
+        """Get the digest of the step (cached)."""
+        if self._digest is None:
+            self._digest = stepdigest(tuple(self))
+
+        return self._digest
+
+    @property
+    def content(self) -> int:
+        """Get the digest of the step by content (cached)."""
+        if self._content is None:
+            self._content = stepdigest(tuple(self), identity=False)
+
+        return self._content
+
+    def __iter__(self) -> Iterator:
+        """Iterate over the function, arguments and keyword arguments."""
+        return iter((self._f, self._args, self._kwargs))
+
+    def __len__(self) -> int:
+        """Return the number of items (like a 3-tuple)."""
+        return 3
+
+    def __getitem__(self, n: int) -> Any:
+        """Return the nth item (like a 3-tuple)."""
+        return (self._f, self._args, self._kwargs)[n]
+
+    def __eq__(self, other) -> bool:
+        """Compare the step items with those of another step or tuple."""
+        if isinstance(other, Step):
+            other = tuple(other)
+        elif not isinstance(other, tuple):
+            return NotImplemented
+
+        return (self._f, self._args, self._kwargs) == other
+
+    def __ne__(self, other) -> bool:
+        """Compare the step items with !=."""
+        equal = self.__eq__(other)
+
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None  # type: ignore  # like a tuple of lists
+
+    def __repr__(self) -> str:
+        """Return the step items as a raw string."""
+        return repr((self._f, self._args, self._kwargs))
+
+
+# In[ ]:
+
+
+def hashkey(x: Any) -> Hashable:
+    """Return a hash key of x (equal objects have equal keys)."""
+    if isinstance(x, Step):
+        return x.key
+    elif isinstance(x, (list, tuple)):
+        return tuple(hashkey(i) for i in x)
+    elif isinstance(x, Mapping):
+        return frozenset((k, hashkey(v)) for k, v in x.items())
+
+    try:
+        hash(x)
+    except TypeError:
+        return None  # compared with == (see Pipeline.index)
+
+    return x
+
+
+# In[ ]:
+
+
+# DIGESTS
+
+# the digest of a step sequence is a polynomial in BASE modulo MODULUS
+MODULUS = 2 ** 127 - 1
+BASE = 0x9E3779B97F4A7C15F39CC0605CEDC835 % MODULUS
+
+PROTOCOL = 4  # of pickled contents (stable across Python versions)
+
+RUNNING = (GeneratorType, CoroutineType, AsyncGeneratorType)  # by state
+
+
+def digest(x: Any, identity: bool = False) -> str:
+    """Return a digest of x by content (or of mutable objects by identity)."""
+    path: dict = dict()  # id: depth (to mark cycles)
+
+    def parts(x):
+        """Return the parts of x that identify it."""
+        if x is None or isinstance(x, (bool, int, float, complex, str)):
+            return [repr(x)]
+        elif isinstance(x, bytes):
+            return [x]
+        elif isinstance(x, tuple):
+            return [feed(i) for i in x]
+        elif isinstance(x, Step):
+            kwargs = tuple(sorted(x.kwargs.items()))
+
+            return [feed(x.f), feed(tuple(x.args)), feed(kwargs)]
+        elif isinstance(x, frozenset):
+            return sorted(feed(i) for i in x)
+        elif isinstance(x, partial):
+            keywords = tuple(sorted(x.keywords.items()))
+
+            return [feed(x.func), feed(x.args), feed(keywords)]
+        elif isinstance(x, MethodType):
+            return [feed(x.__func__), feed(x.__self__)]
+        elif isinstance(x, CodeType):
+            counts = (x.co_argcount, x.co_kwonlyargcount, x.co_flags)
+
+            return [x.co_code, feed(x.co_consts), feed(x.co_names)] + [
+                feed(x.co_varnames),
+                feed(counts),
+            ]
+        elif isinstance(x, FunctionType) and foreign(x):
+            if identity:  # its globals are not those of its module
+                return ["id", str(id(x))]
+
+            raise TypeError(
+                "Cannot digest the content of {} (foreign globals).".format(
+                    x.__qualname__
+                )
+            )
+        elif isinstance(x, FunctionType):
+            cells = tuple(cell(c) for c in x.__closure__ or ())
+            kwdefaults = tuple(sorted((x.__kwdefaults__ or {}).items()))
+            defaults = (x.__defaults__, kwdefaults)
+
+            return [str(x.__module__), x.__qualname__] + [
+                feed(x.__code__),
+                feed(defaults),
+                feed(cells),
+            ]
+        elif hasattr(x, "__qualname__") and not isinstance(x, RUNNING):
+            # classes and builtins
+            owner = getattr(x, "__self__", None)
+            module = getattr(x, "__module__", None)
+            owners = [] if owner is None or ismodule(owner) else [feed(owner)]
+
+            return [str(module), x.__qualname__] + owners
+        elif identity and not valued(x):  # mutable (or unknown) objects
+            return ["id", str(id(x))]
+        elif isinstance(x, bytearray):
+            return [bytes(x)]
+        elif isinstance(x, list):
+            return [feed(i) for i in x]
+        elif isinstance(x, set):
+            return sorted(feed(i) for i in x)
+        elif isinstance(x, Mapping):
+            return sorted(feed(k) + feed(v) for k, v in x.items())
+        elif np is not None and isinstance(x, np.ndarray):
+            return [x.dtype.str, repr(x.shape), x.tobytes()]
+
+        try:  # not by identity: it can be reused once x is freed
+            return [pickle.dumps(x, protocol=PROTOCOL)]
+        except Exception:
+            if identity:
+                return ["id", str(id(x))]
+
+            raise TypeError(
+                "Cannot digest the content of a {} object.".format(
+                    type(x).__name__
+                )
+            ) from None
+
+    def foreign(f):
+        """Return True if the globals of f are not those of its module."""
+        module = sys.modules.get(f.__module__)  # type: ignore
+
+        return getattr(module, "__dict__", None) is not f.__globals__
+
+    def valued(x):
+        """Return True if x is hashed by value (e.g. date, Decimal, enum)."""
+        return type(x).__hash__ not in (None, object.__hash__)
+
+    def cell(c):
+        """Return the content of a closure cell (if any)."""
+        try:
+            return c.cell_contents
+        except ValueError:
+            return None
+
+    def feed(x):
+        """Return the digest of x (or of its depth in a cycle)."""
+        if id(x) in path:
+            return "cycle:{}".format(len(path) - path[id(x)])
+
+        path[id(x)] = len(path)
+        h = blake2b(type(x).__qualname__.encode(), digest_size=16)
+
+        for part in parts(x):
+            h.update(b"\0")
+            h.update(part if isinstance(part, bytes) else part.encode())
+
+        del path[id(x)]
+
+        return h.hexdigest()
+
+    return feed(x)
+
+
+def stepdigest(step: Step, identity: bool = True) -> int:
+    """Return the digest of a step (as a number below MODULUS)."""
+    if isinstance(step, Step):
+        return step.digest if identity else step.content  # cached
+
+    f, args, kwargs = step
+    items = (f, tuple(args), tuple(sorted(kwargs.items())))
+
+    return int(digest(items, identity), 16) % MODULUS
+
+
+def combine(a: int, b: int, n: int) -> int:
+    """Combine the digest a of steps with the digest b of n next steps."""
+    return (a * pow(BASE, n, MODULUS) + b) % MODULUS
+
+
+def contentvalue(steps: "Steps") -> int:
+    """Return the digest of steps by content (stable across processes)."""
+    if steps.body is not None:
+        items = (contentvalue(steps.body), steps.count, steps.until)
+
+        return int(digest(items), 16) % MODULUS
+
+    value = 0
+
+    for node in steps.leaves(repeats=False):
+        if node.body is not None:
+            value = combine(value, contentvalue(node), 1)
+        else:
+            for s in node.flat:
+                value = combine(value, stepdigest(s, False), 1)
+
+    return value
+
+
+# In[ ]:
+
+
+# OPERATIONS
+
+OPERATIONS: Mapping[Function, str] = {
+    map: "map",
+    starmap: "starmap",
+    filter: "filter",
+    filterfalse: "filterfalse",
+    dropwhile: "dropwhile",
+    takewhile: "takewhile",
+    take: "take",
+}
+
+
+def operation(
+    f: Function, args: Args, kwargs: Kwargs
+) -> Optional[Tuple[str, Any]]:
+    """Return the kind and argument of a step if it is element-wise."""
+    if len(args) != 1 or kwargs or not isinstance(f, Hashable):
+        return None
+    elif f not in OPERATIONS:
+        return None
+
+    return OPERATIONS[f], args[0]
+
+
+@lru_cache(maxsize=1024)
+def looper(kinds: Tuple[str, ...]) -> Callable:
+    """Return a generator that runs operations of kinds in a single loop."""
+    names = ["a{}".format(k) for k in range(len(kinds))]
+    head = ["def push(iterable, {}):".format(", ".join(names))]
+    body = ["    for x in iterable:"]
+    halts: list = list()  # checks of the takes passed by the item
+
+    def skip(condition):
+        """Emit a skip of the item (after the checks of previous takes)."""
+        body.append("        if {}:".format(condition))
+        body.extend("    " + halt for halt in halts)
+        body.append("            continue")
+
+    for k, (kind, a) in enumerate(zip(kinds, names)):
+        if kind == "map":
+            body.append("        x = {}(x)".format(a))
+        elif kind == "starmap":
+            body.append("        x = {}(*x)".format(a))
+        elif kind == "filter":
+            skip("not {}(x)".format(a))
+        elif kind == "filterfalse":
+            skip("{}(x)".format(a))
+        elif kind == "dropwhile":
+            head.append("    d{} = True".format(k))
+            skip("d{0} and {1}(x)".format(k, a))
+            body.append("        d{} = False".format(k))
+        elif kind == "takewhile":
+            body.append("        if not {}(x):".format(a))
+            body.append("            return")
+        elif kind == "take":
+            head.extend(["    if {} <= 0:".format(a), "        return"])
+            head.append("    c{} = 0".format(k))
+            body.append("        c{} += 1".format(k))
+            halts.append("        if c{} >= {}:".format(k, a))
+            halts.append("            return")
+
+    body.append("        yield x")
+    source = "\n".join(head + body + halts)
+    filename = "<push-{}>".format(abs(hash(source)))
+    code = compile(source, filename, "exec")
+    lines = source.splitlines(True)
+    linecache.cache[filename] = (len(source), None, lines, filename)
+    scope: dict = dict()
+    exec(code, scope)  # pylint: disable=exec-used
+
+    return scope["push"]
+
+
+def push(
+    operations: Sequence[Tuple[str, Any]], iterable: Iterable
+) -> Iterator:
+    """Push each item of iterable through every operation (in one loop)."""
+    kinds = tuple(kind for kind, a in operations)
+    params = [
+        bool if a is None and kind.startswith("filter") else a
+        for kind, a in operations
+    ]
+
+    return looper(kinds)(iterable, *params)
+
+
+# In[ ]:
+
+
+# VECTORIZATION
+
+
+def isvectorizable(f: Function) -> bool:
+    """Return True if f can be applied on a whole array."""
+    if isinstance(f, np.ufunc):
+        return f.nin == 1 and f.nout == 1
+
+    return isinstance(f, np.vectorize) or getattr(f, "vectorizable", False)
+
+
+def vectorized(f: Function, args: Args, kwargs: Kwargs, state: Any) -> Any:
+    """Apply a map or filter step on a whole array (when possible)."""
+    if np is None or not isinstance(state, np.ndarray):
+        return f(*args, state, **kwargs)
+    elif f not in (map, filter) or len(args) != 1 or kwargs:
+        return f(*args, state, **kwargs)
+
+    g = args[0]
+
+    if f is map and isvectorizable(g):
+        return np.asarray(g(state))
+    elif f is map:
+        return np.array([g(x) for x in state])
+    elif g is None and state.ndim == 1:
+        return state[state.astype(bool)]
+    elif g is not None and isvectorizable(g) and state.ndim == 1:
+        return state[np.asarray(g(state), dtype=bool)]
+
+    g = bool if g is None else g
+    mask = np.fromiter((bool(g(x)) for x in state), bool, len(state))
+
+    return state[mask]
+
+
+# In[ ]:
+
+
+# REPETITION
+
+
+class Repetition:
+    """A Repetition calls a function count times (or until a predicate)."""
+
+    def __init__(
+        self, function: Callable, count: int, until: Optional[Callable] = None
+    ) -> None:
+        """Initialize object."""
+        self.function = function
+        self.count = count
+        self.until = until
+
+    def __call__(self, *args, **kwargs) -> Any:
+        """Call the function in a loop (awaited if it is asynchronous)."""
+        state = self.function(*args, **kwargs)
+
+        if isawaitable(state):
+            return self.wait(state)
+
+        for _ in range(self.count - 1):
+            if self.until is not None and self.until(state):
+                break
+
+            state = self.function(state)
+
+        return state
+
+    async def wait(self, state: Any) -> Any:
+        """Await the function in a loop."""
+        state = await state
+
+        for _ in range(self.count - 1):
+            if self.until is not None and self.until(state):
+                break
+
+            state = await self.function(state)
+
+        return state
+
+
+# In[ ]:
+
+
+def normalize(s: PartialStep) -> Step:
+    """Return a validated step from a partial step."""
+    f = None
+    args: Args = ARGS
+    kwargs: Kwargs = KWARGS
+
+    # fill blanks
+    if isinstance(s, Step):
+        return s  # already validated
+    elif callable(s):
+        f = s
+    elif isinstance(s, Sequence):
+        if len(s) == 1:
+            f = s[0]
+        elif len(s) == 2:
+            f = s[0]
+            args = s[1]
+        elif len(s) == 3:
+            f = s[0]
+            args = s[1]
+            kwargs = s[2]
+        else:
+            raise DefinitionError(
+                "A tuple step should contain 1, 2 or 3 items. Not: {}.".format(
+                    len(s)
+                )
+            )
+    else:
+        raise DefinitionError(
+            "A step should be Callable or Iterable. Not: {}.".format(
+                type(s).__name__
+            )
+        )
+
+    # validate items
+    if not callable(f):
+        raise DefinitionError(
+            "The first step argument should be Callable. Not: {}.".format(
+                type(f).__name__
+            )
+        )
+    elif not isinstance(args, Args):
+        raise DefinitionError(
+            "The second step argument should be Iterable. Not: {}.".format(
+                type(args).__name__
+            )
+        )
+    elif not isinstance(kwargs, Kwargs):
+        raise DefinitionError(
+            "The third step argument should be Mapping. Not: {}.".format(
+                type(kwargs).__name__
+            )
+        )
+
+    return Step(f, args, kwargs)
+
+
+def unchanged(s: PartialStep, step: Step) -> bool:
+    """Return True if s is a copy of step with the same items."""
+    if type(s) is not tuple or len(s) != 3:
+        return False
+
+    f, args, kwargs = s
+
+    return (
+        f is step.f
+        and len(args) == len(step.args)
+        and all(map(is_, args, step.args))
+        and kwargs.keys() == step.kwargs.keys()
+        and all(kwargs[k] is v for k, v in step.kwargs.items())
+    )
+
+
+# In[ ]:
+
+
+class Steps:
+    """A Steps is an immutable sequence of validated steps (shared)."""
+
+    def __init__(
+        self,
+        items: Sequence[Step] = (),
+        parts: Sequence["Steps"] = (),
+        source: Optional["Steps"] = None,
+        span: range = range(0),
+        body: Optional["Steps"] = None,
+        count: int = 0,
+        until: Optional[Callable] = None,
+    ) -> None:
+        """Initialize object from items, parts, a span or a repeated body."""
+        self.parts = tuple(parts)
+        self.source = source
+        self.span = span
+        self.body = body
+        self.count = count
+        self.until = until
+        self.size = len(items) + sum(p.size for p in self.parts)
+        self._flat = None if self.parts else tuple(items)
+
+        if source is not None:  # lazy slice of source
+            self.size = len(span)
+            self._flat = None
+        elif body is not None:  # lazy repetition of body
+            self.size = body.size * count
+            self._flat = None
+
+        # repeated steps are not kept as tuples (O(1) memory in count)
+        self.repeated = (
+            body is not None
+            or any(p.repeated for p in self.parts)
+            or (source is not None and source.repeated)
+        )
+
+        self._keys: Optional[tuple] = None
+        self._index: Optional[dict] = None
+        self._digests: Optional[tuple] = None
+        self._value: Optional[int] = None
+
+    @classmethod
+    def concat(cls, *parts: "Steps") -> "Steps":
+        """Concatenate parts without copying their steps."""
+        parts = tuple(p for p in parts if p.size)
+
+        if len(parts) == 1:
+            return parts[0]
+
+        return cls(parts=parts)
+
+    def slice(self, start: int, stop: int) -> "Steps":
+        """Return the steps from start to stop (without copy)."""
+        if self.source is not None:  # slice the source instead
+            offset = self.span.start
+            span = range(offset + start, offset + stop)
+
+            return Steps(source=self.source, span=span)
+
+        return Steps(source=self, span=range(start, stop))
+
+    def __len__(self) -> int:
+        """Return the number of steps."""
+        return self.size
+
+    def __iter__(self) -> Iterator[Step]:
+        """Iterate over steps (without materializing repetitions)."""
+        return chain.from_iterable(n.flat for n in self.leaves())
+
+    def leaves(self, repeats: bool = True) -> Iterator["Steps"]:
+        """Iterate over leaves in order (and repetitions if not repeats)."""
+        stack = [iter([self])]
+
+        while stack:
+            node = next(stack[-1], None)
+
+            if node is None:
+                stack.pop()
+            elif node.body is not None and repeats:
+                stack.append(repeat(node.body, node.count))
+            elif node.parts:
+                stack.append(iter(node.parts))
+            else:
+                yield node
+
+    def item(self, i: int) -> Step:
+        """Return the step at index i (without materializing repetitions)."""
+        node = self
+
+        while node._flat is None:
+            if node.source is not None:
+                node, i = node.source, node.span[i]
+            elif node.body is not None:
+                node, i = node.body, i % node.body.size
+            else:
+                for part in node.parts:
+                    if i < part.size:
+                        node = part
+                        break
+
+                    i -= part.size
+
+        return node._flat[i]
+
+    @property
+    def flat(self) -> Tuple[Step, ...]:
+        """Get the steps as a tuple (kept unless repeated)."""
+        if self._flat is not None:
+            return self._flat
+        elif self.source is not None and self.source.repeated:
+            flat = tuple(map(self.source.item, self.span))
+        elif self.source is not None:
+            span = self.span
+            flat = self.source.flat[span.start : span.stop]
+        else:
+            flat = tuple(self)
+
+        if not self.repeated:
+            self._flat = flat
+
+        return flat
+
+    @property
+    def keys(self) -> Tuple[Hashable, ...]:
+        """Get the hash key of each step (kept unless repeated)."""
+        if self._keys is not None:
+            return self._keys
+        elif self.source is not None and not self.source.repeated:
+            span = self.span
+            keys = self.source.keys[span.start : span.stop]
+        elif self.parts or self.body is not None:
+            leaves = self.leaves()
+            keys = tuple(chain.from_iterable(n.keys for n in leaves))
+        else:
+            keys = tuple(hashkey(s) for s in self.flat)
+
+        if not self.repeated:
+            self._keys = keys
+
+        return keys
+
+    @property
+    def index(self) -> Mapping[Hashable, Sequence[Step]]:
+        """Get steps by hash key."""
+        if self._index is None and self.body is not None:
+            self._index = self.body.index  # same steps
+        elif self._index is None:
+            index: dict = dict()
+
+            for k, s in zip(self.keys, self.flat):
+                index.setdefault(k, []).append(s)
+
+            self._index = index
+
+        return self._index
+
+    @property
+    def digests(self) -> Tuple[int, ...]:
+        """Get the digest of each step (kept unless repeated)."""
+        if self._digests is not None:
+            return self._digests
+        elif self.source is not None and not self.source.repeated:
+            span = self.span
+            digests = self.source.digests[span.start : span.stop]
+        elif self.parts or self.body is not None:
+            leaves = self.leaves()
+            digests = tuple(chain.from_iterable(n.digests for n in leaves))
+        else:
+            digests = tuple(stepdigest(s) for s in self.flat)
+
+        if not self.repeated:
+            self._digests = digests
+
+        return digests
+
+    @property
+    def value(self) -> int:
+        """Get the digest value (from parts or from each step)."""
+        if self._value is None and self.body is not None:
+            value, n = 0, self.count
+            power, size = self.body.value, self.body.size
+
+            while n > 0:  # by doubling
+                if n % 2:
+                    value = combine(value, power, size)
+
+                power, size = combine(power, power, size), 2 * size
+                n //= 2
+
+            if self.until is not None:  # not the same steps
+                until = int(digest(self.until, True), 16) % MODULUS
+                value = combine(value, until, 1)
+
+            self._value = value
+        elif self._value is None:
+            value = 0
+            parts = self.parts
+            known = all(p._value is not None or not p.parts for p in parts)
+
+            if parts and known:  # combine the digests of parts
+                for p in parts:
+                    value = combine(value, p.value, p.size)
+            else:
+                for node in self.leaves(repeats=False):
+                    if node.body is not None:
+                        value = combine(value, node.value, node.size)
+                    else:
+                        for d in node.digests:
+                            value = combine(value, d, 1)
+
+            self._value = value
+
+        return self._value
+
+    def freeze(self) -> "Steps":
+        """Return immutable steps (with the same digest)."""
+        nodes = []
+
+        for node in self.leaves(repeats=False):
+            if node.body is not None:
+                body, count, until = node.body.freeze(), node.count, node.until
+                nodes.append(Steps(body=body, count=count, until=until))
+            else:
+                leaf = Steps(
+                    [
+                        Step(f, tuple(args), MappingProxyType(dict(kwargs)))
+                        for f, args, kwargs in node.flat
+                    ]
+                )
+                leaf._keys = node.keys
+                leaf._digests = node.digests
+                nodes.append(leaf)
+
+        steps = Steps.concat(*nodes)
+        steps._value = self.value
+
+        return steps
+
+
 # In[17]:
 
 
@@ -36,180 +914,325 @@ class Pipeline:
 
     def __init__(self, steps: Iterable) -> None:
         """Initialize object."""
-        self._steps: list = []
+        self._steps = Steps()
+        self._context: Optional[list] = None
+        self._advices: Tuple[Advice, ...] = ()
+        self._fusion: Optional[tuple] = None  # advices, advice, digest
+        self._applied: Optional[tuple] = None  # advices, storage, applied
         self.steps = steps  # trigger setter
 
     # OBJECT
 
     def __hash__(self) -> int:
-        """Hash step functions."""
-        functions = tuple(f for f, args, kwargs in self.steps)
+        """Hash the pipeline digest."""
+        return hash(self.digest)
+
+    def _derive(self, steps: Steps) -> "Pipeline":
+        """Return a pipeline from validated steps (with the same advices)."""
+        pipeline = self.__class__.__new__(self.__class__)
+        pipeline._steps = steps
+        pipeline._context = None
+        pipeline._advices = self._advices
+        pipeline._fusion = self._fusion  # same advices
+        pipeline._applied = None
+
+        return pipeline
+
+    def _fused(self) -> Tuple[Advice, int]:
+        """Return the fused advices and their digest (cached)."""
+        if self._fusion is None or self._fusion[0] is not self._advices:
+            value = int(digest(self._advices, True), 16) % MODULUS
+            advice = fused(*self._advices) if self._advices else None
+            self._fusion = (self._advices, advice, value)
+
+        return self._fusion[1], self._fusion[2]
+
+    def _advise(self, steps: Iterable[Step]) -> Sequence[Step]:
+        """Return steps with the advices applied (fused in one wrapper)."""
+        if not self._advices:
+            return list(steps)
+
+        advice, value = self._fused()
+        advised = list()
+
+        for s in steps:
+            step = Step(advice(s.f), s.args, s.kwargs)
+            step._digest = combine(stepdigest(s), value, 1)  # not the wrapper
+            advised.append(step)
+
+        return advised
 
-        return hash(functions)
+    def _stack(self) -> int:
+        """Return the digest of the advices (as a number below MODULUS)."""
+        return self._fused()[1]
+
+    def _apply(self, steps: Steps) -> Steps:
+        """Return steps with the advices applied (and the same repetitions)."""
+        nodes = list()
+
+        for node in steps.leaves(repeats=False):
+            if node.body is not None:
+                body, count, until = node.body, node.count, node.until
+                body = self._apply(body)
+                nodes.append(Steps(body=body, count=count, until=until))
+            else:
+                nodes.append(Steps(self._advise(node.flat)))
+
+        return Steps.concat(*nodes)
+
+    def _align(self, other: "Pipeline") -> Tuple["Pipeline", "Pipeline"]:
+        """Return self and other with the same advices (applied if not)."""
+        if self._advices == other._advices:
+            return self, other
+
+        return self.apply(), other.apply()
+
+    def _program(self, build: Callable) -> Sequence[Step]:
+        """Return advised steps with repetitions as single steps."""
+        steps: list = list()
+
+        for node in self.apply().storage.leaves(repeats=False):
+            if node.body is not None:  # advised in the body
+                body = build(Pipeline(node.body))
+                function = Repetition(body, node.count, node.until)
+                steps.append(Step(function))
+            else:
+                steps.extend(node.flat)
+
+        return steps
 
     # PROPERTY
 
+    @property
+    def storage(self) -> Steps:
+        """Get the (shared) storage of pipeline steps."""
+        if self._context is not None:  # steps can change in a context
+            return Steps([normalize(s) for s in self._context])
+
+        return self._steps
+
     @property
     def steps(self) -> Sequence[Step]:
         """Get pipeline steps."""
-        return self._steps
+        if self._context is not None:
+            return self._context
 
-    @steps.setter
-    def steps(self, steps: Iterable[PartialStep]) -> None:
-        """Assign pipeline steps."""
-        self._steps = []
+        return list(self._steps.flat)
 
-        for s in steps:
-            f = None
-            args: list = list()
-            kwargs: dict = dict()
-
-            # fill blanks
-            if callable(s):
-                f = s
-            elif isinstance(s, Sequence):
-                if len(s) == 1:
-                    f = s[0]
-                elif len(s) == 2:
-                    f = s[0]
-                    args = s[1]
-                elif len(s) == 3:
-                    f = s[0]
-                    args = s[1]
-                    kwargs = s[2]
-                else:
-                    raise DefinitionError(
-                        "A tuple step should contain 1, 2 or 3 items. Not: {}.".format(
-                            len(s)
-                        )
-                    )
-            else:
-                raise DefinitionError(
-                    "A step should be Callable or Iterable. Not: {}.".format(
-                        type(s).__name__
-                    )
-                )
+    @property
+    def keys(self) -> Sequence[Hashable]:
+        """Get the hash key of each step."""
+        return self.storage.keys
 
-            # validate items
-            if not callable(f):
-                raise DefinitionError(
-                    "The first step argument should be Callable. Not: {}.".format(
-                        type(f).__name__
-                    )
-                )
-            elif not isinstance(args, Args):
-                raise DefinitionError(
-                    "The second step argument should be Iterable. Not: {}.".format(
-                        type(args).__name__
-                    )
-                )
-            elif not isinstance(kwargs, Kwargs):
-                raise DefinitionError(
-                    "The third step argument should be Mapping. Not: {}.".format(
-                        type(kwargs).__name__
-                    )
-                )
+    @property
+    def index(self) -> Mapping[Hashable, Sequence[Step]]:
+        """Get pipeline steps by hash key."""
+        return self.storage.index
+
+    @property
+    def digests(self) -> Sequence[int]:
+        """Get the digest of each step."""
+        return self.storage.digests
+
+    @property
+    def digest(self) -> str:
+        """Get the pipeline digest (from the steps and the advices)."""
+        value = self.storage.value
 
-            step = (f, args, kwargs)
-            self._steps.append(step)
+        if self._advices:
+            value = combine(value, self._stack(), 1)
+
+        return "{:032x}".format(value)
+
+    @property
+    def advices(self) -> Tuple[Advice, ...]:
+        """Get the advices applied at composition (innermost first)."""
+        return self._advices
+
+    @steps.setter
+    def steps(self, steps: Iterable[PartialStep]) -> None:
+        """Assign pipeline steps (only new steps are validated)."""
+        if isinstance(steps, Pipeline):
+            self._steps = steps.storage
+        elif isinstance(steps, Steps):
+            self._steps = steps
+        else:
+            self._steps = Steps([normalize(s) for s in steps])
 
     # CONTEXT
 
-    def __enter__(self) -> Sequence[Step]:
-        """Return steps in a context."""
-        return self.steps
+    def __enter__(self) -> Sequence[PartialStep]:
+        """Return a copy of the steps in a context (as 3-tuples)."""
+        self._context = [
+            (f, list(args), dict(kwargs)) for f, args, kwargs in self._steps
+        ]
+
+        return self._context
 
     def __exit__(self, exc_type, exc_value, traceback) -> None:
-        """Update steps from a context."""
-        self.steps = self.steps  # trigger setter
+        """Update steps from a context (unchanged steps are kept)."""
+        steps, self._context = self._context, None
+        olds = self._steps.flat
+        self.steps = [  # trigger setter
+            olds[i] if i < len(olds) and unchanged(s, olds[i]) else s
+            for i, s in enumerate(steps)
+        ]
 
     # OPERATION
 
     def __or__(self, f: Callable) -> "Pipeline":
-        """Add a function step."""
-        steps: list = list()
-        steps.extend(self.steps)
-        steps.append(f)
+        """Add a function step (without the advices)."""
+        step = Steps([normalize(f)])
+        pipeline = self.apply()
 
-        return self.__class__(steps)
+        return pipeline._derive(Steps.concat(pipeline.storage, step))
 
     def __and__(self, other: "Pipeline") -> "Pipeline":
         """Keep common steps."""
-        steps = [s for s in self.steps if s in other.steps]
+        left, right = self._align(other)
+        storage = left.storage
+        steps = [
+            s for s, k in zip(storage.flat, storage.keys) if right.has(s, k)
+        ]
 
-        return self.__class__(steps)
+        return left._derive(Steps(steps))
 
     def __xor__(self, other: "Pipeline") -> "Pipeline":
         """Keep uncommon steps."""
-        return (self + other) - (self & other)
+        left, right = self._align(other)
+
+        return (left + right) - (left & right)
 
     def __add__(self, other: "Pipeline") -> "Pipeline":
         """Concatenate every steps."""
-        steps: list = list()
-        steps.extend(self.steps)
-        steps.extend(other.steps)
+        left, right = self._align(other)
 
-        return self.__class__(steps)
+        return left._derive(Steps.concat(left.storage, right.storage))
 
     def __sub__(self, other: "Pipeline") -> "Pipeline":
         """Intersect common steps."""
-        steps = [s for s in self.steps if s not in other.steps]
+        left, right = self._align(other)
+        storage = left.storage
+        steps = [
+            s
+            for s, k in zip(storage.flat, storage.keys)
+            if not right.has(s, k)
+        ]
 
-        return self.__class__(steps)
+        return left._derive(Steps(steps))
 
     def __mul__(self, n: int) -> "Pipeline":
         """Duplicate steps n times."""
-        steps: list = []
-
-        for _ in range(n):
-            steps.extend(self.steps)
+        return self.repeat(n)
+
+    def repeat(self, n: int, until: Optional[Callable] = None) -> "Pipeline":
+        """Repeat steps n times in a loop (or until a predicate holds)."""
+        if until is not None and not callable(until):
+            raise DefinitionError(
+                "The until predicate should be Callable. Not: {}.".format(
+                    type(until).__name__
+                )
+            )
 
-        return self.__class__(steps)
+        if n <= 0:
+            return self._derive(Steps())
+        elif n == 1 and until is None:
+            return self._derive(self.storage)
 
-    def __matmul__(self, advice: Advice) -> "Pipeline":
-        """Apply advice to step functions."""
-        steps = [(advice(f), args, kwargs) for f, args, kwargs in self.steps]
+        steps = Steps(body=self.storage, count=n, until=until)
 
-        return self.__class__(steps)
+        return self._derive(steps)
 
-    def __truediv__(self, n: int) -> Sequence["Pipeline"]:
+    def __matmul__(self, advice: Advice) -> "Pipeline":
+        """Add an advice to step functions (applied at composition)."""
+        return self.advise(*self._advices, advice)
+
+    def advise(self, *advices: Advice) -> "Pipeline":
+        """Return the steps with these advices (innermost first)."""
+        pipeline = self._derive(self.storage)
+        pipeline._advices = advices
+
+        return pipeline
+
+    def unadvise(self, *advices: Union[Advice, str]) -> "Pipeline":
+        """Remove advices (or every advice made by a function name)."""
+        return self.advise(
+            *[
+                a
+                for a in self._advices
+                if a not in advices and advicename(a) not in advices
+            ]
+        )
+
+    def deduplicate(self) -> "Pipeline":
+        """Keep the outermost advice made by each function (e.g. cacheable)."""
+        names = [advicename(a) for a in self._advices]
+        advices = [
+            a
+            for i, a in enumerate(self._advices)
+            if names[i] not in names[i + 1 :]
+        ]
+
+        return self.advise(*advices)
+
+    def apply(self) -> "Pipeline":
+        """Return a pipeline with the advices applied to its steps."""
+        if not self._advices:
+            return self
+
+        storage, applied = self.storage, self._applied
+
+        if applied is None or applied[0] is not self._advices:
+            applied = None
+        elif applied[1] is not storage:
+            applied = None
+
+        if applied is None:
+            applied = (self._advices, storage, self._apply(storage))
+            self._applied = applied if self._context is None else None
+
+        pipeline = self._derive(applied[2])  # the same advised steps
+        pipeline._advices = ()
+
+        return pipeline
+
+    def __truediv__(self, n: int) -> Sequence["PipelineView"]:
         """Create step chunks of size n (strict)."""
         ps = []
-        starts = range(0, len(self.steps), n)
-        ends = range(n, len(self.steps) + n, n)
+        starts = range(0, len(self), n)
+        ends = range(n, len(self) + n, n)
 
         for start, end in zip(starts, ends):
-            steps = self.steps[start:end]
-            pipe = self.__class__(steps)
-            ps.append(pipe)
+            view = self[start:end]
+            ps.append(view)
 
         return ps
 
-    def __floordiv__(self, n: int) -> Sequence["Pipeline"]:
+    def __floordiv__(self, n: int) -> Sequence["PipelineView"]:
         """Create step chunks of size n (longest)."""
         ps = []
-        ends = range(n, len(self.steps), n)
-        starts = range(0, len(self.steps), n)
+        ends = range(n, len(self), n)
+        starts = range(0, len(self), n)
 
         for start, end in zip(starts, ends):
-            steps = self.steps[start:end]
-            pipe = self.__class__(steps)
-            ps.append(pipe)
+            view = self[start:end]
+            ps.append(view)
 
         return ps
 
     def __mod__(self, other: "Pipeline") -> "Pipeline":
         """Alternate between self and other steps."""
-        gen = chain.from_iterable(zip_longest(self.steps, other.steps))
-        steps = [s for s in gen if s is not None]
+        left, right = self._align(other)
+        pairs = zip_longest(left.storage.flat, right.storage.flat)
+        steps = [s for s in chain.from_iterable(pairs) if s is not None]
 
-        return self.__class__(steps)
+        return left._derive(Steps(steps))
 
     # CONVERTION
 
     def __str__(self) -> str:
         """Return steps as a string."""
-        return " -> ".join(f.__name__ for f, args, kwargs in self.steps)
+        return " -> ".join(s.name for s in self)
 
     def __repr__(self) -> str:
         """Return steps as a raw string."""
@@ -217,20 +1240,13 @@ class Pipeline:
 
     def __bool__(self) -> bool:
         """Return True if steps is not empty."""
-        return len(self.steps) > 0
+        return len(self) > 0
 
-    def __call__(self) -> Callable:
-        """Return a Callable through composition."""
-        if not self.steps:
+    def __call__(self, flat: bool = False) -> Callable:
+        """Return a Callable through composition (or a flat loop)."""
+        if not self:
             raise CompositionError("Cannot compose from an empty pipeline.")
 
-        def part(step):
-            """Apply partial to one step."""
-            f, args, kwargs = step
-            h = partial(f, *args, **kwargs)
-
-            return h
-
         def comp(f, g):
             """Apply compose to two steps."""
 
@@ -239,32 +1255,383 @@ class Pipeline:
 
             return composition
 
-        functions = map(part, self.steps)
+        def loop(functions):
+            """Apply every step in a loop."""
+            first, *others = functions
+
+            def execution(*args, **kwargs):
+                state = first(*args, **kwargs)
+
+                for g in others:
+                    state = g(state)
+
+                return state
+
+            return execution
+
+        program = self._program(partial(Pipeline.__call__, flat=True))
+        functions = [s.partial for s in program]
+
+        if flat:
+            return loop(functions)
+
         function = reduce(comp, functions)
 
         return function
 
+    def coroutine(self) -> Callable:
+        """Return a coroutine function that awaits awaitable steps."""
+        if not self:
+            raise CompositionError("Cannot compose from an empty pipeline.")
+
+        program = self._program(Pipeline.coroutine)
+        first, *others = [s.partial for s in program]
+
+        async def execution(*args, **kwargs):
+            state = first(*args, **kwargs)
+
+            if isawaitable(state):
+                state = await state
+
+            for g in others:
+                state = g(state)
+
+                if isawaitable(state):
+                    state = await state
+
+            return state
+
+        return execution
+
+    def compile(self) -> Callable:
+        """Return a Callable generated from the steps source."""
+        if not self:
+            raise CompositionError("Cannot compose from an empty pipeline.")
+
+        scope: dict = dict()
+        names: dict = dict()
+        calls: list = list()
+
+        def bind(x, name):
+            """Bind x to a global name (once per object)."""
+            if id(x) not in names:
+                names[id(x)] = name
+                scope[name] = x
+
+            return names[id(x)]
+
+        def isidentifier(k):
+            """Return True if k can be inlined as a keyword."""
+            return isinstance(k, str) and k.isidentifier() and not iskeyword(k)
+
+        for i, (f, args, kwargs) in enumerate(self._program(Pipeline.compile)):
+            fname = bind(f, "f{}".format(i))
+            params = [
+                bind(x, "a{}_{}".format(i, j)) for j, x in enumerate(args)
+            ]
+
+            if i == 0:
+                scope["k0"] = dict(kwargs)
+                params.append("*args")
+                params.append("**{**k0, **kwargs}" if kwargs else "**kwargs")
+            elif all(isidentifier(k) for k in kwargs):
+                params.append("state")
+
+                for j, (k, v) in enumerate(kwargs.items()):
+                    kname = bind(v, "k{}_{}".format(i, j))
+                    params.append("{}={}".format(k, kname))
+            else:
+                scope["k{}".format(i)] = dict(kwargs)
+                params.append("state")
+                params.append("**k{}".format(i))
+
+            calls.append("    state = {}({})".format(fname, ", ".join(params)))
+
+        source = "\n".join(
+            ["def pipeline(*args, **kwargs):"] + calls + ["    return state"]
+        )
+        filename = "<pipeline-{}>".format(abs(hash(source)))
+        code = compile(source, filename, "exec")
+        lines = source.splitlines(True)
+        linecache.cache[filename] = (len(source), None, lines, filename)
+        exec(code, scope)  # pylint: disable=exec-used
+
+        return scope["pipeline"]
+
+    def fuse(self, n: int = 2) -> Tuple["Pipeline", Sequence[range]]:
+        """Fuse runs of n element-wise steps or more (and report them)."""
+        if self._advices:
+            return self.apply().fuse(n)
+
+        steps: list = list()
+        fused: list = list()
+        run: list = list()
+
+        def flush():
+            """Fuse or keep the current run of steps."""
+            if len(run) >= n:
+                operations = tuple(op for i, step, op in run)
+                steps.append((push, [operations]))
+                fused.append(range(run[0][0], run[-1][0] + 1))
+            else:
+                steps.extend(step for i, step, op in run)
+
+            run.clear()
+
+        for i, step in enumerate(self.storage.flat):  # read the steps once
+            op = operation(*step)
+
+            if op is not None:
+                run.append((i, step, op))
+            else:
+                flush()
+                steps.append(step)
+
+        flush()
+
+        return self.__class__(steps), fused
+
+    def stream(self, iterable: Iterable) -> Any:
+        """Push items one by one through element-wise steps."""
+        if not self:
+            raise CompositionError("Cannot compose from an empty pipeline.")
+
+        pipeline, _ = self.fuse(1)
+        state: Any = iterable
+
+        for f, args, kwargs in pipeline.steps:
+            state = f(*args, state, **kwargs)
+
+        return state
+
+    def pipelined(
+        self,
+        iterable: Iterable,
+        size: int = 1,
+        maxsize: int = 1,
+        prefetch: int = 1,
+    ) -> Iterator:
+        """Apply the pipeline to each item in stages of size steps."""
+        if not self:
+            raise CompositionError("Cannot compose from an empty pipeline.")
+
+        functions = [p(flat=True) for p in self / size]
+
+        return pipelined(functions, iterable, maxsize, prefetch)
+
+    def vectorize(self, array: Any) -> Any:
+        """Apply map and filter steps on whole arrays (when possible)."""
+        if not self:
+            raise CompositionError("Cannot compose from an empty pipeline.")
+
+        state: Any = array
+
+        for f, args, kwargs in self.apply():
+            state = vectorized(f, args, kwargs, state)
+
+        return state
+
+    def checkpoint(
+        self, cache: Any, every: int = 1, copy: bool = True
+    ) -> Callable:
+        """Return a Callable that resumes from the longest cached prefix."""
+        if not self:
+            raise CompositionError("Cannot compose from an empty pipeline.")
+
+        stages: list = list()  # (function, digest of the prefix)
+        value = 0
+
+        try:  # by content: the keys outlive the steps (e.g. on disk)
+            if self._advices:  # results depend on the advices
+                value = int(digest(self._advices), 16) % MODULUS
+
+            for node in self.storage.leaves(repeats=False):
+                if node.body is not None:
+                    body = Pipeline(node.body).advise(*self._advices)
+                    function = body(flat=True)
+                    function = Repetition(function, node.count, node.until)
+                    value = combine(value, contentvalue(node), 1)
+                    stages.append((function, value))
+                else:
+                    for s, a in zip(node.flat, self._advise(node.flat)):
+                        value = combine(value, stepdigest(s, False), 1)
+                        stages.append((a.partial, value))
+        except TypeError as error:
+            raise CompositionError(
+                "Cannot checkpoint steps without a content digest: {}".format(
+                    error
+                )
+            ) from None
+
+        missing = object()
+        last = len(stages) - 1
+        clone = deepcopy if copy else lambda state: state
+
+        def execution(*args, **kwargs):
+            try:
+                source = digest((args, kwargs))
+                keys = ["{}-{:032x}".format(source, v) for _, v in stages]
+            except TypeError:  # inputs without a content digest
+                keys = []
+
+            start, state = 0, missing
+
+            for i in reversed(range(len(keys))):
+                state = cache.get(keys[i], missing)
+
+                if state is not missing:
+                    start, state = i + 1, clone(state)
+                    break
+
+            for i in range(start, len(stages)):
+                f = stages[i][0]
+                state = f(*args, **kwargs) if i == 0 else f(state)
+
+                if not keys or isinstance(state, Iterator):
+                    continue  # consumed once
+
+                if (i + 1) % every == 0 or i == last:
+                    cache.set(keys[i], clone(state))
+
+            return state
+
+        return execution
+
+    def within(self, seconds: float) -> Callable:
+        """Return a Callable that fails fast once seconds have passed."""
+        if not self:
+            raise CompositionError("Cannot compose from an empty pipeline.")
+
+        program = self._program(partial(Pipeline.__call__, flat=True))
+        first, *others = [s.partial for s in program]
+
+        def execution(*args, **kwargs):
+            with deadline(seconds):  # seen by every step
+                check()
+                state = first(*args, **kwargs)
+
+                for g in others:
+                    check()
+                    state = g(state)
+
+            return state
+
+        return execution
+
+    def profile(
+        self, profile: Optional[Profile] = None, prefix: str = ""
+    ) -> Callable:
+        """Return a Callable that records the latency of each step.
+
+        Records are named by position and name (e.g. "1:inc"), and the steps
+        of a repetition by its position (e.g. "2.0:inc" in the repetition 2).
+        """
+        if not self:
+            raise CompositionError("Cannot compose from an empty pipeline.")
+
+        profile = Profile() if profile is None else profile
+        prefixes: list = list()
+        position = 0
+
+        for node in self.storage.leaves(repeats=False):
+            if node.body is not None:
+                prefixes.append("{}{}.".format(prefix, position))
+                position += 1
+            else:
+                position += len(node.flat)
+
+        bodies = iter(prefixes)  # repetitions are built in order
+
+        def build(body):
+            return body.profile(profile, next(bodies))
+
+        program = self._program(build)
+        first, *others = [
+            timed(s.partial, "{}{}:{}".format(prefix, i, s.name), profile)
+            for i, s in enumerate(program)
+        ]
+
+        def execution(*args, **kwargs):
+            state = first(*args, **kwargs)
+
+            for g in others:
+                state = g(state)
+
+            return state
+
+        execution.profile = profile  # type: ignore
+
+        return execution
+
+    def observe(self, events: Optional[Events] = None) -> Callable:
+        """Return a Callable that emits the start, end and error of steps."""
+        if not self:
+            raise CompositionError("Cannot compose from an empty pipeline.")
+
+        events = Events() if events is None else events
+        program = self._program(partial(Pipeline.observe, events=events))
+        plain = [s.partial for s in program]
+        emitted = [emitting(s.partial, s.name, events) for s in program]
+        modes = {False: (plain[0], plain[1:]), True: (emitted[0], emitted[1:])}
+
+        def execution(*args, **kwargs):
+            first, others = modes[events.active]  # no cost without subscribers
+            state = first(*args, **kwargs)
+
+            for g in others:
+                state = g(state)
+
+            return state
+
+        execution.events = events  # type: ignore
+
+        return execution
+
+    def freeze(self) -> "FrozenPipeline":
+        """Return an immutable pipeline (interned by digest)."""
+        return FrozenPipeline(self)
+
     # COLLECTION
 
     def __len__(self) -> int:
         """Return the number of steps."""
-        return len(self.steps)
+        return len(self.storage)
 
     def __iter__(self) -> Iterable[Step]:
         """Iterate over steps."""
-        return iter(self.steps)
+        return iter(self.storage)
+
+    def __getitem__(self, n: Union[int, slice]) -> Any:
+        """Return the nth step (or a view of a slice of steps)."""
+        if isinstance(n, slice):
+            span = range(len(self))[n]
+
+            if span.step == 1:
+                return PipelineView(self, span.start, span.stop)
 
-    def __getitem__(self, n: int) -> Step:
-        """Return the nth step."""
-        return self.steps[n]
+            return self._derive(Steps(tuple(map(self.storage.item, span))))
+
+        return self.storage.item(range(len(self))[n])
 
     def __contains__(self, step: Step) -> bool:
-        """Return True if step is in steps."""
-        return step in self.steps
+        """Return True if step is in steps (with the advices applied)."""
+        return self.apply().has(step)
+
+    def has(self, step: Step, key: Hashable = None) -> bool:
+        """Return True if step (with an optional hash key) is in steps."""
+        if key is None and not isinstance(step, Step):
+            try:
+                step = normalize(step)  # e.g. (f, args) as (f, args, {})
+            except DefinitionError:
+                return False
+
+        candidates = self.index.get(hashkey(step) if key is None else key, [])
+
+        return any(s is step or s == step for s in candidates)
 
     def __reversed__(self) -> "Pipeline":
         """Reverse the order of steps."""
-        return self.__class__(reversed(self.steps))
+        return self._derive(Steps(self.storage.flat[::-1]))
 
     # COMPARISON
 
@@ -285,12 +1652,17 @@ class Pipeline:
         return len(self) >= len(other)
 
     def __eq__(self, other) -> bool:
-        """Compare the step lengths with ==."""
-        return len(self.steps) == len(other.steps)
+        """Compare the pipeline digests and advices with == (as __hash__)."""
+        if not isinstance(other, Pipeline):
+            return NotImplemented
+
+        return self.digest == other.digest and self._stack() == other._stack()
 
     def __ne__(self, other) -> bool:
-        """Compare the step lengths with !=."""
-        return len(self.steps) != len(other.steps)
+        """Compare the pipeline digests and advices with !=."""
+        equal = self.__eq__(other)
+
+        return equal if equal is NotImplemented else not equal
 
     def __pow__(self, other: "Pipeline") -> bool:
         """Compare the pipeline functions in order."""
@@ -301,16 +1673,173 @@ class Pipeline:
 
     def __lshift__(self, other: "Pipeline") -> bool:
         """Return True if self is a subset of other."""
-        for s in self.steps:
-            if s not in other.steps:
+        left, right = self._align(other)
+
+        for s, k in zip(left, left.keys):
+            if not right.has(s, k):
                 return False
 
         return True
 
     def __rshift__(self, other: "Pipeline") -> bool:
         """Return True if self is a superset of other."""
-        for s in other.steps:
-            if s not in self.steps:
+        left, right = self._align(other)
+
+        for s, k in zip(right, right.keys):
+            if not left.has(s, k):
                 return False
 
         return True
+
+
+# In[ ]:
+
+
+class FrozenPipeline(Pipeline):
+    """A FrozenPipeline is an immutable and interned Pipeline."""
+
+    _lock = threading.Lock()
+    _interned: WeakValueDictionary = WeakValueDictionary()
+
+    def __new__(cls, steps: Iterable) -> "FrozenPipeline":
+        """Return the interned object for the digest of these steps."""
+        if isinstance(steps, Pipeline):
+            steps = steps.apply().storage
+        elif not isinstance(steps, Steps):
+            steps = Pipeline(steps).storage
+
+        key = "{:032x}".format(steps.value)
+
+        with cls._lock:
+            self = cls._interned.get(key)
+
+            if self is None:
+                self = super().__new__(cls)
+                self._steps = steps.freeze()
+                self._context = None
+                self._advices = ()
+                self._fusion = None
+                self._applied = None
+                self._cache = dict()
+                cls._interned[key] = self
+
+        return self
+
+    def __init__(self, steps: Iterable) -> None:
+        """Initialize object (see __new__)."""
+
+    def __reduce__(self) -> tuple:
+        """Pickle the steps (interned again when unpickled)."""
+        steps = [(f, list(args), dict(kwargs)) for f, args, kwargs in self]
+
+        return (FrozenPipeline, (Pipeline(steps),))
+
+    def _derive(self, steps: Steps) -> "Pipeline":
+        """Return a frozen pipeline from validated steps."""
+        return FrozenPipeline(steps)
+
+    def advise(self, *advices: Advice) -> "Pipeline":
+        """Return a frozen pipeline with advices applied to the steps."""
+        return FrozenPipeline(Pipeline(self._steps).advise(*advices))
+
+    # PROPERTY
+
+    @property
+    def steps(self) -> Sequence[Step]:
+        """Get pipeline steps."""
+        return self._steps.flat
+
+    @steps.setter
+    def steps(self, steps: Iterable[PartialStep]) -> None:
+        """Forbid the assignment of steps."""
+        raise DefinitionError("Cannot assign the steps of a frozen pipeline.")
+
+    # CONTEXT
+
+    def __enter__(self) -> Sequence[Step]:
+        """Return steps in a context (immutable)."""
+        return self.steps
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Keep steps from a context."""
+
+    # CONVERTION
+
+    def __call__(self, flat: bool = False) -> Callable:
+        """Return the cached Callable through composition."""
+        key = ("call", flat)
+
+        if key not in self._cache:
+            self._cache[key] = super().__call__(flat)
+
+        return self._cache[key]
+
+    def coroutine(self) -> Callable:
+        """Return the cached coroutine function."""
+        key = ("coroutine",)
+
+        if key not in self._cache:
+            self._cache[key] = super().coroutine()
+
+        return self._cache[key]
+
+    def compile(self) -> Callable:
+        """Return the cached Callable generated from the steps source."""
+        key = ("compile",)
+
+        if key not in self._cache:
+            self._cache[key] = super().compile()
+
+        return self._cache[key]
+
+    def freeze(self) -> "FrozenPipeline":
+        """Return the pipeline itself."""
+        return self
+
+
+# In[ ]:
+
+
+class PipelineView(Pipeline):
+    """A PipelineView is a range of the steps of a parent pipeline."""
+
+    def __init__(self, parent: Pipeline, start: int, stop: int) -> None:
+        """Initialize object (without copying the parent steps)."""
+        self.parent = parent
+        self.span = range(start, max(start, stop))
+        self._steps = parent.storage.slice(self.span.start, self.span.stop)
+        self._context = None
+        self._advices = parent.advices
+        self._fusion = None
+        self._applied = None
+
+    def __reduce__(self) -> tuple:
+        """Pickle the spanned steps and the advices (not the parent)."""
+        parent = Pipeline(list(self.steps)).advise(*self._advices)
+
+        return (PipelineView, (parent, 0, len(self)))
+
+    def _derive(self, steps: Steps) -> Pipeline:
+        """Return a (full) pipeline from validated steps."""
+        return Pipeline(steps).advise(*self._advices)
+
+    # PROPERTY
+
+    @property
+    def steps(self) -> Sequence[Step]:
+        """Get pipeline steps."""
+        return self._steps.flat
+
+    @steps.setter
+    def steps(self, steps: Iterable[PartialStep]) -> None:
+        """Forbid the assignment of steps."""
+        raise DefinitionError("Cannot assign the steps of a pipeline view.")
+
+    # CONTEXT
+
+    def __enter__(self) -> Sequence[Step]:
+        """Return steps in a context (immutable)."""
+        return self.steps
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Keep steps from a context."""
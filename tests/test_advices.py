@@ -4,12 +4,17 @@
 # In[1]:
 
 
+import time
 import pytest
+import logging
+import asyncio
 import ipytest
 
+from functools import reduce
 from unittest.mock import Mock
 
-from gampy import advices
+from gampy import advices, caches, functions
+from gampy.errors import DeadlineError, DefinitionError
 
 
 # In[2]:
@@ -20,6 +25,18 @@ div10 = lambda x: 10 / x
 gdict = lambda x: {0: 0, 1: 1}.get(x)
 
 
+async def adiv10(x):
+    return 10 / x
+
+
+async def agdict(x):
+    return gdict(x)
+
+
+async def apow(x, y):
+    return x ** y
+
+
 # In[3]:
 
 
@@ -47,11 +64,124 @@ def test_cacheable():
     assert f(10) == 10
 
     assert mock.call_count == 2
+    assert f.cache_info().hits == 2 and f.cache_info().currsize == 2
+
+    mock = Mock(return_value=10)
+    f = advices.cacheable(0)(mock)
+    assert f(5) == f(5) == f([5]) == f([5]) == 10
+    assert mock.call_count == 4 and f.cache_info().currsize == 0
+
+    mock = Mock(side_effect=TypeError("by f"))
+    f = advices.cacheable()(mock)
+
+    with pytest.raises(TypeError, match="by f"):
+        f(5)
+    with pytest.raises(TypeError, match="by f"):
+        f([5])
+    assert mock.call_count == 2
+
+    cache = caches.Cache(0)
+    cache.set(1, 1)
+    assert len(cache) == 0 and 1 not in cache
+
+
+# In[ ]:
+
+
+def test_cacheable_bounds():
+    mock = Mock(side_effect=lambda x, **kw: len(x))
+    f = advices.cacheable(2, ttl=60, policy="lfu")(mock)
+
+    assert f([1, 2]) == 2
+    assert f([1, 2]) == 2
+    assert f({"a": 1}, key=[1]) == 1
+    assert f({"a": 1}, key=[1]) == 1
+    assert f([1]) == 1
+
+    assert mock.call_count == 3
+    assert f.cache_info().hits == 2
+    assert f.cache_info().evictions == 1
+
+    f.cache_clear()
+    assert f.cache_info().currsize == 0
+
+    np = pytest.importorskip("numpy")
+    mock = Mock(side_effect=lambda x: x.sum())
+    f = advices.cacheable(size=10 ** 6)(mock)
+
+    assert f(np.arange(10)) == f(np.arange(10)) == 45
+    assert f(np.arange(11)) == 55
+    assert mock.call_count == 2
+    assert f.cache_info().nbytes > 0
+
+
+class Frame:
+    def __init__(self, x):
+        self.x = x
+
+    def __eq__(self, other):  # unhashable (like a DataFrame)
+        return isinstance(other, Frame) and self.x == other.x
+
+
+def test_cacheable_content():
+    f = advices.cacheable()(lambda frame: frame.x * 10)
+
+    assert [f(Frame(i)) for i in range(5)] == [0, 10, 20, 30, 40]
+    assert f(Frame(4)) == 40 and f.cache_info().hits == 1
+
+    mock = Mock(return_value=1)
+    f = advices.cacheable()(mock)
+    items = [(i for i in range(3))]  # a generator has no content digest
+
+    assert f(items) == f(items) == 1
+    assert mock.call_count == 2 and f.cache_info().currsize == 0
+
+
+# In[ ]:
+
+
+CALLS = []
+
+
+def total(x):
+    CALLS.append(x)
+    return sum(x)
+
+
+def test_persistable(tmp_path):
+    path = str(tmp_path / "cache.db")
+    f = advices.persistable(path)(total)
+
+    assert f([1, 2]) == f([1, 2]) == 3
+    assert CALLS == [[1, 2]]
+
+    g = advices.persistable(path, warm=10)(total)  # after a restart
+    assert g([1, 2]) == 3
+    assert CALLS == [[1, 2]]
+    assert g.cache_info().hits == 1
+
+    h = advices.persistable(path)(div10)  # another function
+    assert h(5) == 2 and h.cache_info().currsize == 1
+
+    with pytest.raises(DefinitionError):
+        advices.persistable(path)(Mock())  # no content digest
 
 
 # In[5]:
 
 
+def test_vectorizable():
+    f = advices.vectorizable()(div10)
+
+    assert f(5) == 2
+    assert f.vectorizable
+    assert f.__wrapped__ is div10
+    assert not hasattr(div10, "vectorizable")
+
+
+# In[ ]:
+
+
 def test_constable():
     f = advices.constable(9)(div10)
 
@@ -204,6 +334,253 @@ def test_traceable():
 test_traceable()
 
 
+# In[ ]:
+
+
+def test_lazy_logging():
+    logger = Mock(spec=logging.Logger)
+    logger.isEnabledFor.return_value = False
+    f = advices.loggable(logger)(int)
+
+    assert f(1) == 1
+    assert not logger.log.called
+
+    logger.isEnabledFor.return_value = True
+
+    assert f(2) == 2
+    assert logger.log.call_args_list == [
+        ((logging.INFO, "enter: %s", "int"), {}),
+        ((logging.INFO, "exit: %s", "int"), {}),
+    ]
+
+    mock = Mock()
+    f = advices.loggable(mock, post=False, sample=3)(int)
+
+    assert [f(i) for i in range(7)] == list(range(7))
+    assert mock.call_count == 3
+    assert advices.loggable(mock, False, False)(int) is int
+    assert advices.traceable(mock, False, False)(int) is int
+
+    mock = Mock()
+    f = advices.traceable(mock, post=True, size=10)(list)
+
+    assert f("x" * 1000) == ["x"] * 1000
+    assert mock.call_args_list[0] == (("[PRE] list('xx...xxx')",), {})
+    assert len(mock.call_args_list[1][0][0]) < 80
+
+
+# In[ ]:
+
+
+def test_retryable_wait():
+    mock = Mock(side_effect=IndexError)
+    f = advices.retryable(n=3, w=0.01)(mock)
+
+    start = time.perf_counter()
+    assert f() is None
+    assert time.perf_counter() - start >= 0.02
+    assert mock.call_count == 3
+
+
+# In[ ]:
+
+
+def test_retryable_backoff():
+    mock = Mock(side_effect=IndexError)
+    f = advices.retryable(n=4, w=0.01, backoff=2, jitter=0.5)(mock)
+
+    start = time.perf_counter()
+    assert f() is None
+    assert time.perf_counter() - start >= 0.035
+    assert mock.call_count == 4
+
+    mock = Mock(side_effect=IndexError)
+    f = advices.retryable(n=10, w=1)(mock)
+
+    with functions.deadline(0.5):
+        with pytest.raises(DeadlineError):
+            f()
+
+    assert mock.call_count == 1
+
+
+# In[ ]:
+
+
+def test_timeoutable():
+    f = advices.timeoutable(0.01)(time.sleep)
+
+    assert f(0) is None
+
+    with pytest.raises(DeadlineError):
+        f(0.1)
+
+    g = advices.timeoutable()(time.sleep)
+
+    assert g(0.01) is None
+
+    with functions.deadline(0.01):
+        with pytest.raises(DeadlineError):
+            g(0.1)
+
+    calls = []
+
+    def hang(x):
+        calls.append(x)
+        time.sleep(0.1 if len(calls) == 1 else 0)
+        return x
+
+    f = advices.retryable(n=3)(advices.timeoutable(0.02)(hang))
+    assert f(7) == 7 and calls == [7, 7]
+
+    async def asleep(x):
+        await asyncio.sleep(x)
+        return x
+
+    h = advices.timeoutable(0.01)(asleep)
+    assert asyncio.run(h(0)) == 0
+
+    with pytest.raises(DeadlineError):
+        asyncio.run(h(1))
+
+
+# In[ ]:
+
+
+def test_profilable():
+    profilable = advices.profilable()
+
+    def outer(x):
+        time.sleep(0.01)
+        return inner(x)
+
+    inner = profilable(time.sleep)
+    outer = profilable(outer)
+    outer(0.01)
+
+    stats = outer.profile.stats()
+    name = "test_profilable.<locals>.outer"
+    assert stats[name]["calls"] == stats["sleep"]["calls"] == 1
+    assert stats[name]["total"] >= 0.02
+    assert 0.01 <= stats[name]["self"] < stats[name]["total"]
+
+    with pytest.raises(ZeroDivisionError):
+        profilable(div10)(0)
+    assert outer.profile.stats()["<lambda>"]["calls"] == 1
+
+    f = profilable(adiv10)
+    assert asyncio.run(f(5)) == 2
+    assert f.profile.stats()["adiv10"]["calls"] == 1
+
+    first = advices.profilable(name="first")(lambda x: x)
+    second = advices.profilable(first.profile, "second")(lambda x: x)
+    first(1), second(2), second(3)
+    assert set(first.profile.stats()) == {"first", "second"}
+    assert first.profile.stats()["second"]["calls"] == 2
+
+
+# In[ ]:
+
+
+def test_fused():
+    calls = []
+
+    def flaky(x):
+        calls.append(x)
+
+        if len(calls) % 2:
+            raise KeyError(x)
+
+        return gdict(x)
+
+    stack = [
+        advices.retryable(n=3),
+        advices.exceptional(-1, on=ZeroDivisionError),
+        advices.optional(9),
+        advices.loggable(Mock(), post=False),
+        advices.identical(),
+    ]
+    nested = lambda f: reduce(lambda g, a: a(g), stack, f)
+    fused = advices.fused(*stack)
+
+    for f, x in [(div10, 5), (div10, 0), (gdict, 5), (flaky, 1)]:
+        calls.clear()
+        expected = nested(f)(x)
+        calls.clear()
+        assert fused(f)(x) == expected
+        assert fused(f).__wrapped__ is f  # a single wrapper
+
+    calls.clear()
+    assert advices.fused(advices.retryable(n=2))(flaky)(1) == 1
+    assert calls == [1, 1]
+
+    with pytest.raises(ZeroDivisionError):
+        advices.fused(advices.optional(0), advices.postable(Mock()))(div10)(0)
+
+    mock = Mock(return_value=1)
+    f = advices.fused(advices.optional(0), advices.cacheable(), stack[2])
+    g = f(mock)
+    assert g(1) == g(1) == 1 and mock.call_count == 1
+    assert g.__wrapped__.__wrapped__.__wrapped__ is mock
+
+    f = advices.fused(advices.exceptional(0), advices.fluentable())
+    assert f(list.append)([], 1) == [1]
+
+    f = advices.fused(*stack)(adiv10)
+    assert asyncio.run(f(5)) == 2 and asyncio.run(f(0)) == 9
+
+
+# In[ ]:
+
+
+def test_coroutines():
+    def run(f, *args):
+        return asyncio.run(f(*args))
+
+    assert run(advices.identical()(adiv10), 5) == 2
+    assert run(advices.constable(9)(adiv10), 0) == 9
+    assert run(advices.flippable()(apow), 2, 3) == 9
+    assert run(advices.optional(9)(agdict), 5) == 9
+    assert run(advices.exceptional(9)(adiv10), 0) == 9
+    assert run(advices.retryable(9, w=0.01)(adiv10), 0) == 9
+
+    calls = []
+
+    async def acall(x):
+        calls.append(x)
+        return x
+
+    async def cached(f):
+        return [await f(1), await f(1), await f(2)]
+
+    assert run(cached, advices.cacheable()(acall)) == [1, 1, 2]
+    assert calls == [1, 2]
+
+    mock = Mock()
+    f = advices.fluentable()(acall)
+    assert run(f, 3) == 3
+
+    f = advices.postable(mock)(advices.preable(mock)(acall))
+    assert run(f, 4) == 4
+    assert mock.call_count == 2
+
+    mock = Mock()
+    f = advices.loggable(mock)(acall)
+    assert run(f, 5) == 5
+    assert mock.call_args_list == [
+        (("enter: acall",), {}),
+        (("exit: acall",), {}),
+    ]
+
+    mock = Mock()
+    f = advices.traceable(mock, True, True)(acall)
+    assert run(f, 6) == 6
+    assert mock.call_args_list == [
+        (("[PRE] acall(6)",), {}),
+        (("[POST] acall(6) -> 6",), {}),
+    ]
+
+
 # In[31]:
 
 
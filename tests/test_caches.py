@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+import pytest
+import ipytest
+import multiprocessing
+
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from gampy import caches
+from gampy.errors import DefinitionError
+
+
+# In[ ]:
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+# In[ ]:
+
+
+def test_cachekey():
+    key = caches.cachekey
+
+    assert key((1, [2]), {"a": {"b": 3}}) == key((1, [2]), {"a": {"b": 3}})
+    assert key((1, [2]), {}) != key((1, (2,)), {})
+    assert key((1,), {"a": 1, "b": 2}) == key((1,), {"b": 2, "a": 1})
+    assert key((1,), {}) == key((1.0,), {})
+    assert key((1,), {}, typed=True) != key((1.0,), {}, typed=True)
+    hash(key(([1], {2: [3]}), {"x": set()}))
+    assert key(([(i for i in ())],), {}) is None  # no content digest
+
+
+# In[ ]:
+
+
+def test_sizeof():
+    assert caches.sizeof([b"x" * 1000]) > 1000
+    assert caches.sizeof({"a": "x" * 1000}) > 1000
+
+    np = pytest.importorskip("numpy")
+    array = np.zeros(1000)
+    assert caches.sizeof(array) > 8000
+    assert caches.sizeof(array[:500]) > 4000
+
+
+# In[ ]:
+
+
+def test_cache_lru():
+    cache = caches.Cache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.get("b") is caches.MISSING
+    assert cache.get("b", 0) == 0
+    assert cache.info() == (1, 2, 1, 0, 2, 2, 0)
+
+    cache.clear()
+    assert len(cache) == 0 and cache.info().hits == 0
+
+
+# In[ ]:
+
+
+def test_cache_lfu():
+    cache = caches.Cache(2, policy="lfu")
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+    cache.set("c", 3)
+
+    assert "a" in cache and "b" not in cache and "c" in cache
+
+    cache.set("d", 4)
+    assert "a" in cache and "c" not in cache and "d" in cache
+    assert cache.info().evictions == 2
+
+    with pytest.raises(DefinitionError):
+        caches.Cache(policy="fifo")
+
+
+# In[ ]:
+
+
+def test_cache_ttl():
+    clock = Clock()
+    cache = caches.Cache(ttl=10, clock=clock)
+    cache.set("a", 1)
+    clock.now = 9
+    assert cache.get("a") == 1
+    clock.now = 10
+    assert "a" not in cache
+    assert cache.get("a") is caches.MISSING
+    assert cache.info().expirations == 1 and len(cache) == 0
+
+
+# In[ ]:
+
+
+def test_cache_size():
+    cache = caches.Cache(None, size=100, sizer=len)
+    cache.set("a", "x" * 60)
+    cache.set("b", "x" * 30)
+    assert cache.info().nbytes == 90
+
+    cache.set("c", "x" * 30)
+    assert "a" not in cache and cache.info().nbytes == 60
+
+    cache.set("d", "x" * 101)
+    assert "d" not in cache and len(cache) == 2
+
+
+# In[ ]:
+
+
+def test_disk_cache(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = caches.DiskCache(path)
+    cache.set("a", [1, 2])
+    cache.set(("b", 1), {"c": 3})
+
+    assert cache.get("a") == cache.get("a") == [1, 2]
+    assert cache.get(("b", 1)) == {"c": 3}
+    assert cache.get("c") is caches.MISSING and "a" in cache
+    assert cache.info()[:3] == (3, 1, 0) and cache.info().currsize == 2
+
+    other = caches.DiskCache(path, warm=1)  # a restart (or another process)
+    assert list(other.hot.values()) == [[1, 2]]
+    assert other.get(("b", 1)) == {"c": 3}
+
+    space = caches.DiskCache(path, space="other")
+    assert space.get("a") is caches.MISSING
+
+    cache.clear()
+    assert other.get(("b", 1)) is caches.MISSING and len(space.hot) == 0
+
+    for i in range(1, 6):  # keyed by content (not by identity)
+        cache.set(date(2020, 1, i), i)
+
+    assert [cache.get(date(2020, 1, i)) for i in range(1, 6)] == [
+        1,
+        2,
+        3,
+        4,
+        5,
+    ]
+    assert other.keyof(date(2020, 1, 1)) == cache.keyof(date(2020, 1, 1))
+
+    generator = (i for i in range(3))  # no persistent key
+    cache.set(generator, 1)
+    assert generator not in cache and cache.get(generator) is caches.MISSING
+
+
+# In[ ]:
+
+
+def test_disk_cache_size(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = caches.DiskCache(
+        path, size=100, dumps=str.encode, loads=bytes.decode
+    )
+    cache.set("a", "x" * 60)
+    cache.set("b", "x" * 30)
+    cache.get("a")
+    cache.set("c", "x" * 30)
+
+    assert "a" in cache and "b" not in cache and "c" in cache
+    assert cache.info().nbytes == 90 and cache.info().evictions == 1
+
+    cache.set("d", "x" * 101)
+    assert "d" not in cache
+
+    cache.set("c", "x" * 10)  # replaced
+    (total,) = cache.connect().execute("SELECT nbytes FROM total").fetchone()
+    assert total == cache.info().nbytes == 70
+
+
+# In[ ]:
+
+
+def test_disk_cache_hot(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = caches.DiskCache(
+        path, size=100, dumps=str.encode, loads=bytes.decode
+    )
+    cache.set("a", "x" * 30)
+    cache.set("b", "x" * 30)
+    cache.get("a")
+
+    hot = caches.DiskCache(
+        path, size=100, warm=1, dumps=str.encode, loads=bytes.decode
+    )
+    assert list(hot.hot) == ["a"]
+
+    for _ in range(3):
+        hot.get("a")  # in memory
+
+    cache.get("b")
+    cache.get("b")
+    hot.set("c", "x" * 30)  # evict after the uses of hot entries
+    hot.set("d", "x" * 30)
+
+    assert "a" in cache and "b" not in cache and hot.info().hits == 3
+    warmed = caches.DiskCache(path, warm=1, loads=bytes.decode)
+    assert list(warmed.hot) == ["a"]
+
+
+# In[ ]:
+
+
+def test_disk_cache_threads(tmp_path):
+    cache = caches.DiskCache(str(tmp_path / "cache.db"))
+
+    def work(i):
+        for j in range(20):
+            cache.set((i, j), i * j)
+
+        return [cache.get((i, j)) for j in range(20)]
+
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(work, range(4)))
+
+    assert results == [[i * j for j in range(20)] for i in range(4)]
+    assert cache.info().currsize == 80
+
+
+# In[ ]:
+
+
+def work(path, i):
+    cache = caches.DiskCache(path, size=10000)
+
+    for j in range(20):
+        cache.set((i, j), i * j)
+
+    return [cache.get((i, j)) for j in range(20)]
+
+
+def test_disk_cache_processes(tmp_path):
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("fork is not available")
+
+    path = str(tmp_path / "cache.db")
+    caches.DiskCache(path)  # create the schema
+    context = multiprocessing.get_context("fork")
+
+    with ProcessPoolExecutor(4, mp_context=context) as pool:
+        results = list(pool.map(work, [path] * 4, range(4)))
+
+    cache = caches.DiskCache(path)
+    assert results == [[i * j for j in range(20)] for i in range(4)]
+    assert cache.info().currsize == 80
+    assert cache.get((3, 19)) == 57
+
+
+# In[ ]:
+
+
+ipytest.run_tests()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+import json
+import pytest
+import asyncio
+import ipytest
+
+from gampy import events
+from gampy.errors import DefinitionError
+
+
+# In[ ]:
+
+
+def test_events():
+    bus = events.Events()
+    starts, every = [], []
+
+    assert not bus
+    bus.emit(events.START, "f", 0)  # without subscribers
+
+    bus.subscribe(starts.append, events.START)
+    bus.subscribe(every.append)
+    bus.emit(events.START, "f", 0)
+    bus.emit(events.ERROR, "f", 0, KeyError(1))
+
+    assert bus and len(starts) == 1 and len(every) == 2
+    assert every[0].kind == "start" and every[0].name == "f"
+    assert every[1].time >= every[0].time and every[1].error.args == (1,)
+
+    bus.unsubscribe(every.append)
+    bus.unsubscribe(starts.append)
+    bus.emit(events.START, "f", 0)
+    assert not bus and len(starts) == 1 and len(every) == 2
+
+    with pytest.raises(DefinitionError):
+        bus.subscribe(print, "stop")
+
+
+# In[ ]:
+
+
+def test_recorder():
+    recorder = events.Recorder(size=5)
+    E = events.Event
+
+    for event in [
+        E("start", "f", 0, 1),  # dropped from the ring buffer
+        E("start", "g", 1000, 1),
+        E("end", "g", 2000, 1),
+        E("end", "f", 3000, 1),
+        E("start", "f", 4000, 1),
+        E("start", "h", 4500, 2),
+        E("error", "h", 5000, 2, ValueError()),
+    ]:
+        recorder(event)
+
+    assert [e.kind for e in recorder.balanced()] == [
+        "start",
+        "start",
+        "error",
+        "end",
+    ]
+
+    chrome = json.loads(recorder.chrome())["traceEvents"]
+    assert [e["ph"] for e in chrome] == ["B", "B", "E", "E"]
+    assert chrome[2]["args"] == {"error": "ValueError()"}
+    assert chrome[3]["ts"] == 5.0 and chrome[3]["name"] == "f"
+
+    speedscope = json.loads(recorder.speedscope())
+    assert speedscope["shared"]["frames"] == [{"name": "f"}, {"name": "h"}]
+    assert [len(p["events"]) for p in speedscope["profiles"]] == [2, 2]
+    assert speedscope["profiles"][0]["endValue"] == 5000
+
+    recorder.clear()
+    assert recorder.balanced() == []
+
+
+# In[ ]:
+
+
+def test_emitting():
+    bus = events.Events()
+    recorder = bus.subscribe(events.Recorder())
+    f = events.emitting(lambda x: 10 / x, "div10", bus)
+
+    assert f(5) == 2
+
+    with pytest.raises(ZeroDivisionError):
+        f(0)
+
+    async def adiv10(x):
+        return 10 / x
+
+    g = events.emitting(adiv10, "adiv10", bus)
+    assert asyncio.run(g(5)) == 2
+    assert [(e.kind, e.name) for e in recorder.events] == [
+        ("start", "div10"),
+        ("end", "div10"),
+        ("start", "div10"),
+        ("error", "div10"),
+        ("start", "adiv10"),
+        ("end", "adiv10"),
+    ]
+
+
+# In[ ]:
+
+
+ipytest.run_tests()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+import time
+import pytest
+import ipytest
+import threading
+
+from itertools import count
+
+from gampy import functions
+from gampy.errors import DeadlineError
+from gampy.structures import Pipeline
+
+
+# In[ ]:
+
+
+def inc(x):
+    return x + 1
+
+
+def power(base, exp=1):
+    return base ** exp
+
+
+# In[ ]:
+
+
+def test_take():
+    assert list(functions.take(3, range(10))) == [0, 1, 2]
+    assert list(functions.take(3, count())) == [0, 1, 2]
+    assert list(functions.take(3, [])) == []
+    assert list(functions.take(0, count())) == []
+
+
+# In[ ]:
+
+
+def test_pmap():
+    expected = [abs(x) for x in range(-50, 50)]
+
+    assert list(functions.pmap(abs, range(-50, 50))) == expected
+    assert list(functions.pmap(abs, iter(range(-50, 50)))) == expected
+    assert list(functions.pmap(abs, [], workers=2)) == []
+
+    results = functions.pmap(abs, range(-50, 50), ordered=False, chunksize=7)
+    assert sorted(results) == sorted(expected)
+
+    results = functions.pmap(abs, range(-50, 50), workers=2, processes=True)
+    assert list(results) == expected
+
+    pulled = []
+
+    def source():
+        for i in count():
+            pulled.append(i)
+            yield i
+
+    results = functions.pmap(inc, source(), workers=2, chunksize=1)
+    assert next(results) == 1
+    assert len(pulled) <= 4
+    results.close()
+
+    p = Pipeline([(functions.pmap, [inc], {"workers": 2}), list])
+    assert p()(range(10)) == list(range(1, 11))
+
+
+# In[ ]:
+
+
+def test_pipelined():
+    threads = threading.active_count()
+
+    results = functions.pipelined([inc, str], range(10), prefetch=2)
+    assert list(results) == [str(x + 1) for x in range(10)]
+    assert list(functions.pipelined([inc], [])) == []
+
+    results = functions.pipelined([inc, lambda x: 1 / (x - 3)], range(10))
+    assert next(results) == -0.5
+
+    with pytest.raises(ZeroDivisionError):
+        list(results)
+
+    results = functions.pipelined([inc], count())
+    assert next(results) == 1
+    results.close()
+
+    assert threading.active_count() == threads
+
+    p = Pipeline([inc, (power, [], {"exp": 2}), str])
+    assert list(p.pipelined(range(3), size=2)) == ["1", "4", "9"]
+
+
+# In[ ]:
+
+
+def test_deadline():
+    assert functions.remaining() is None
+    functions.check()
+
+    with functions.deadline(10):
+        assert 9 < functions.remaining() <= 10
+
+        with functions.deadline(20):
+            assert functions.remaining() <= 10
+
+        with functions.deadline(0):
+            with pytest.raises(DeadlineError):
+                functions.check()
+
+    assert functions.remaining() is None
+
+
+# In[ ]:
+
+
+def test_within():
+    assert functions.within(inc, 1, 1) == 2
+    assert functions.within(functions.remaining, 1) is None
+
+    with pytest.raises(DeadlineError):
+        functions.within(time.sleep, 0.01, 1)
+
+    with pytest.raises(DeadlineError):
+        functions.within(inc, 0, 1)
+
+    with pytest.raises(ZeroDivisionError):
+        functions.within(lambda: 1 / 0, 1)
+
+    with functions.deadline(5):
+        assert functions.within(functions.remaining, 1) <= 5
+
+
+# In[ ]:
+
+
+ipytest.run_tests()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+import ipytest
+
+from gampy import profiles
+
+
+# In[ ]:
+
+
+def test_record():
+    record = profiles.Record()
+
+    for ns in range(1, 1001):
+        record.add(ns * 1000, ns * 500)
+
+    assert record.calls == 1000 and record.max == 10 ** 6
+    assert record.total == 500500000 and record.own == 250250000
+    assert abs(record.quantile(0.5) - 500000) / 500000 < 0.05
+    assert abs(record.quantile(0.99) - 990000) / 990000 < 0.05
+    assert record.quantile(0) <= record.quantile(1) <= record.max
+
+
+# In[ ]:
+
+
+def test_profile():
+    profile = profiles.Profile()
+    add = profile.recorder("f")
+    add(2000, 1000)
+    add(4000, 3000)
+    profile.recorder('g"\n')(10 ** 9, 10 ** 9)
+
+    stats = profile.stats()
+    assert list(stats) == ['g"\n', "f"]
+    assert stats["f"]["calls"] == 2 and stats["f"]["total"] == 6e-6
+    assert stats["f"]["self"] == 4e-6 and stats["f"]["mean"] == 3e-6
+    assert stats["f"]["p50"] <= stats["f"]["p99"] == stats["f"]["max"]
+
+    text = profile.prometheus()
+    assert 'gampy_step_seconds_count{step="f"} 2\n' in text
+    assert 'gampy_step_seconds_sum{step="f"} 6e-06\n' in text
+    assert 'gampy_step_self_seconds_total{step="f"} 4e-06\n' in text
+    assert 'gampy_step_seconds{step="f",quantile="0.99"}' in text
+    assert 'step="g\\"\\n"' in text
+    assert text.count("# TYPE") == 2
+
+    profile.clear()
+    assert profile.stats() == {}
+
+
+# In[ ]:
+
+
+ipytest.run_tests()
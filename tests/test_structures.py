@@ -4,13 +4,25 @@
 # In[1]:
 
 
+import time
+import pickle
 import pytest
+import asyncio
 import ipytest
 
+from decimal import Decimal
+from multiprocessing import get_context
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
 from functools import reduce
+from unittest.mock import Mock
+from itertools import count, starmap, dropwhile, takewhile, filterfalse
 
-from gampy.structures import Pipeline
-from gampy.errors import DefinitionError, CompositionError
+from gampy import advices, caches, events
+from gampy.structures import Pipeline, PipelineView, FrozenPipeline
+from gampy.structures import Step, digest
+from gampy.errors import DefinitionError, CompositionError, DeadlineError
+from gampy.functions import take, remaining
 
 
 # In[2]:
@@ -98,6 +110,321 @@ def test_hash():
     assert hash(P0) != hash(P1)
 
 
+# In[ ]:
+
+
+def test_digest():
+    assert digest(1) != digest(1.0) != digest(True)
+    assert digest([1]) != digest((1,))
+    assert digest({"a": 1, "b": 2}) == digest({"b": 2, "a": 1})
+    assert digest(lambda x: x + 1) == digest(lambda x: x + 1)
+    assert digest(lambda x: x + 1) != digest(lambda x: x + 2)
+    assert digest(", ".join) != digest("-".join)
+
+    p = Pipeline([(map, (inc,)), (filter, [iseven]), list])
+    assert P0.digest == p.digest
+    assert P0.digest == (P00 + P01 + P02).digest == (P00 + P01 | list).digest
+    assert P0.digest != Pipeline([(map, [inc], {"x": 0}), filter, list]).digest
+    assert P0.digest != (P01 + P00 + P02).digest
+    assert P0.digest == P0.freeze().digest
+    assert hash(P0) == hash(P0.freeze())
+
+    p = Pipeline([(add, [1])])
+    q = Pipeline([(add, (1,), {})])
+    assert p.freeze() is q.freeze()
+    assert p.freeze() is not Pipeline([(add, [True])]).freeze()
+
+    def collect(acc, x):
+        acc.append(x)
+        return acc
+
+    a, b, d1, d2 = [], [], {}, {}
+    p = Pipeline([(collect, [a])]).freeze()
+    q = Pipeline([(collect, [b])]).freeze()
+    assert p is not q and p is Pipeline([(collect, [a])]).freeze()
+    assert q()(1) == [1] and a == []
+    assert digest(a, True) != digest([], True) and digest(a) == digest([])
+    assert Pipeline([d1.setdefault]).digest != Pipeline([d2.setdefault]).digest
+
+    day, half = date(2020, 1, 1), Decimal("0.5")
+    assert Pipeline([(add, [day])]) == Pipeline([(add, [date(2020, 1, 1)])])
+    assert Pipeline([(add, [half])]) == Pipeline([(add, [Decimal("0.5")])])
+    assert digest(timedelta(1), True) == digest(timedelta(days=1), True)
+
+
+# In[ ]:
+
+
+def test_digest_functions():
+    kwargs = {"x": 5, "y": 1}
+    pa = Pipeline([(lambda x, y: x - y, [], kwargs)])
+    pb = Pipeline([(lambda y, x: y - x, [], kwargs)])
+    assert pa.digest != pb.digest and pa.freeze() is not pb.freeze()
+    assert pa.freeze()()() == 4 and pb.freeze()()() == -4
+
+    one, two = {"k": 1}, {"k": 2}
+    exec("def read(x):\n    return x + k", one)  # pylint: disable=exec-used
+    exec("def read(x):\n    return x + k", two)  # pylint: disable=exec-used
+    p, q = Pipeline([one["read"]]), Pipeline([two["read"]])
+    assert p.digest != q.digest and p.freeze() is not q.freeze()
+    assert p.freeze()()(0) == 1 and q.freeze()()(0) == 2
+
+    f = P0.compile()
+    assert f.__module__ is None
+    assert Pipeline([f]) == Pipeline([f]) and hash(Pipeline([f]))
+    assert Pipeline([f]).freeze()()(range(3)) == [2]
+
+    with pytest.raises(TypeError):
+        digest(f)  # no content digest
+
+
+# In[ ]:
+
+
+def test_storage():
+    p = P00 | list
+    assert p.storage.parts[0] is P00.storage
+    assert (P0 * 1000).digest == Pipeline(P0.steps * 1000).digest
+    assert len(P0 * 1000) == 3000 and (P0 * 1000)[-1] == (list, [], {})
+
+    with p as steps:
+        steps.append(filter)
+    assert p.steps[0] is P00.steps[0]
+    assert p.steps[-1] == (filter, [], {})
+
+    with pytest.raises(DefinitionError):
+        with p as steps:
+            steps.append(1)
+
+
+# In[ ]:
+
+
+def test_step():
+    s, t = Pipeline([list, (map, [inc])])
+    f, args, kwargs = t
+    assert isinstance(s, Step) and f is map and args == [inc] and kwargs == {}
+    assert s == (list, [], {}) and s != (list, [inc], {})
+    assert s.args is Pipeline([sorted])[0].args
+    assert s.kwargs is Pipeline([sorted])[0].kwargs
+    assert s.partial is s.partial and s.partial("ab") == ["a", "b"]
+    assert s.name == "list" and s.digest == Pipeline([list]).digests[0]
+    assert Pipeline([s]).storage.flat[0] is s
+
+    with pytest.raises(TypeError):
+        s.args.append(inc)
+
+
+# In[ ]:
+
+
+def same(f):  # a picklable advice
+    return f
+
+
+def test_view():
+    p = Pipeline([(map, [inc]), (map, [inc]), (filter, [iseven]), list])
+    v = p[1:]
+    assert isinstance(v, PipelineView) and v.parent is p and len(v) == 3
+    assert v.storage.source is p.storage and v[1:].storage.source is p.storage
+    assert v[0] is p[1] and v.steps == tuple(p.steps[1:])
+    assert v()(range(5)) == [2, 4]
+    assert (v | sorted)()(range(5)) == [2, 4]
+    assert type(v | sorted) is Pipeline
+    assert v.digest == Pipeline(p.steps[1:]).digest
+    assert [len(c) for c in p / 3] == [3, 1]
+    assert all(isinstance(c, PipelineView) for c in p // 2)
+    assert len(p[3:1]) == 0 and len(p[::2]) == 2
+
+    with pytest.raises(DefinitionError):
+        v.steps = []
+
+    small, large = (P0 * 2 | inc)[1:3], (P0 * 1000 | inc)[1:3]
+    assert len(pickle.dumps(small)) == len(pickle.dumps(large))
+
+    chunk = pickle.loads(pickle.dumps((P0 @ same)[1:3]))
+    assert isinstance(chunk, PipelineView) and len(chunk.parent) == 2
+    assert chunk.steps == tuple(P0.steps[1:]) and len(chunk.advices) == 1
+    assert chunk()([1, 2, 4]) == [2, 4]
+
+
+# In[ ]:
+
+
+def test_repeat():
+    p = Pipeline([inc, (add, [1])])
+    assert (p * 10 ** 6)()(0) == 2 * 10 ** 6
+    assert (p * 10 ** 6).storage.body is p.storage
+    assert len(p * 3) == 6 and list(p * 3) == p.steps * 3
+    assert (p.repeat(10 ** 6, until=lambda x: x >= 10) | inc)()(0) == 11
+    assert (p * 100).compile()(0) == (p * 100)(flat=True)(0) == 200
+    assert (Pipeline([inc]) * 3 * 4 | inc).compile()(0) == 13
+    assert (p * 1000).freeze()(flat=True)(0) == 2000
+    assert (p * 3).digest == Pipeline(p.steps * 3).digest
+    assert (p * 3).digest != p.repeat(3, until=bool).digest
+    assert (p * 3 + p * 2).digest == (p * 5).digest
+    assert len(p * 0) == 0 and (p * 1).storage is p.storage
+
+    big = P0 * 4 * 10 ** 6 | sorted
+    assert big[0] is P0[0] and big[-2] is P0[-1] and big[-1].f is sorted
+    assert big[7] is P0[1] and big[11_999_998::2][1].f is sorted
+    assert big[3_000_000:3_000_002].steps == tuple(P0.steps[:2])
+    assert list(reversed(big[:4]))[0] is P0[0] and big[:4] << P0
+    assert all(n._flat is None for n in (big.storage, big.storage.parts[0]))
+    assert big.storage.parts[0].body.body is P0.storage  # kept as is
+
+    with pytest.raises(IndexError):
+        big[len(big)]
+
+    async def ainc(x):
+        return x + 1
+
+    f = Pipeline([ainc, inc]).repeat(10, until=lambda x: x > 5).coroutine()
+    assert asyncio.run(f(0)) == 6
+
+    with pytest.raises(DefinitionError):
+        p.repeat(2, until=1)
+
+
+# In[ ]:
+
+
+def test_checkpoint():
+    calls = []
+
+    def log(x, name):
+        calls.append(name)
+        return x + [name]
+
+    cache = caches.Cache(None)
+    p = Pipeline([(log, [], {"name": n}) for n in "abc"])
+    assert p.checkpoint(cache)([]) == ["a", "b", "c"]
+    assert calls == ["a", "b", "c"]
+
+    q = p[:2] | (log, [], {"name": "d"})
+    assert q.checkpoint(cache)([]) == ["a", "b", "d"]
+    assert calls == ["a", "b", "c", "d"]
+    assert q.checkpoint(cache)([]) == ["a", "b", "d"]
+    assert calls == ["a", "b", "c", "d"]
+
+    assert p.checkpoint(cache)([0]) == [0, "a", "b", "c"]
+    assert len(calls) == 7
+
+    r = Pipeline([(log, [], {"name": "e"})]) * 3 | (map, [str]) | list
+    assert r.checkpoint(cache, every=2)([]) == ["e", "e", "e"]
+    assert r.checkpoint(cache, every=2)([]) == ["e", "e", "e"]
+    assert calls.count("e") == 3
+
+
+# In[ ]:
+
+
+def test_checkpoint_content():
+    def nxt(day):
+        return day + timedelta(days=1)
+
+    def push(x):
+        x.append(len(x))
+        return x
+
+    cache = caches.Cache(None)
+    f = Pipeline([nxt, date.isoformat]).checkpoint(cache)
+    days = [date(2020, 1, i) for i in range(1, 5)]
+    expected = ["2020-01-02", "2020-01-03", "2020-01-04", "2020-01-05"]
+    assert [f(d) for d in days] == expected
+
+    g = Pipeline([push, push]).checkpoint(cache)
+    assert g([]) == [0, 1] and g([]) == [0, 1]
+    assert Pipeline([push]).checkpoint(cache)([]) == [0]  # a copy
+
+    calls = []
+
+    def size(x):
+        calls.append(x)
+        return len(x)
+
+    h = Pipeline([size]).checkpoint(cache)
+    items = [(i for i in range(3))]  # not checkpointed
+    assert h(items) == h(items) == 1 and len(calls) == 2
+
+    with pytest.raises(CompositionError):
+        Pipeline([(map, [Mock()])]).checkpoint(cache)
+
+
+# In[ ]:
+
+
+def test_within():
+    assert Pipeline([inc, inc]).within(1)(0) == 2
+
+    calls = []
+    p = Pipeline([time.sleep, calls.append])
+
+    with pytest.raises(DeadlineError):
+        p.within(0.01)(0.05)
+    assert calls == []
+
+    f = Pipeline([remaining]).within(5)
+    assert 0 < f() <= 5
+
+
+# In[ ]:
+
+
+def test_profile():
+    def nap(x):
+        time.sleep(0.01)
+        return x
+
+    f = (Pipeline([inc, nap]) * 2 | inc).profile()
+    assert f(0) == 3
+    stats = f.profile.stats()
+
+    assert list(stats)[0] == "0.1:nap"
+    assert set(stats) == {"0:Repetition", "0.0:inc", "0.1:nap", "1:inc"}
+    assert stats["0.0:inc"]["calls"] == 2 and stats["1:inc"]["calls"] == 1
+    repetition = stats["0:Repetition"]
+    assert repetition["total"] >= 0.02 > repetition["self"]
+
+    f = Pipeline([inc, nap, inc, inc]).profile()
+    assert f(0) == 3
+    assert set(f.profile.stats()) == {"0:inc", "1:nap", "2:inc", "3:inc"}
+
+    with pytest.raises(CompositionError):
+        Pipeline([]).profile()
+
+
+# In[ ]:
+
+
+def test_observe():
+    p = Pipeline([add]) + Pipeline([inc, inc]) * 2 | inc
+    f = p.observe()
+    recorder = events.Recorder()
+
+    assert f(0, 1) == 6
+    assert not f.events and not recorder.events
+
+    f.events.subscribe(recorder)
+    assert f(0, 1) == 6
+    calls = [(e.kind, e.name) for e in recorder.events]
+
+    assert calls[:3] == [
+        ("start", "add"),
+        ("end", "add"),
+        ("start", "Repetition"),
+    ]
+    assert calls.count(("end", "inc")) == 5 and len(calls) == 14
+
+    with pytest.raises(TypeError):
+        f(0)
+
+    assert recorder.events[-1].kind == "error"
+
+    with pytest.raises(CompositionError):
+        Pipeline([]).observe()
+
+
 # In[6]:
 
 
@@ -135,6 +462,20 @@ def test_context():
         (reduce, [add], {}),
     ]
 
+    first = pipeline.steps[0]
+
+    with pipeline as p:
+        p[1][1][0] = str
+        assert pipeline()() == "0123456789"
+        assert str(pipeline) == "range -> map -> reduce"
+        assert pipeline.digest == Pipeline(p).digest
+
+    assert pipeline.steps[0] is first and (map, [str], {}) in pipeline
+    assert pipeline()() == "0123456789" and (map, [inc], {}) not in pipeline
+
+    with pytest.raises(AttributeError):
+        first.f = list
+
 
 # In[9]:
 
@@ -208,6 +549,64 @@ def test_matmul():
     assert f(0, k=1) == 10
 
 
+# In[ ]:
+
+
+def test_advise():
+    calls = []
+    plus = lambda f: lambda x: f(x) + 1
+    twice = lambda f: lambda x: f(x) * 2
+    cached, logged = advices.cacheable(), advices.loggable(calls.append)
+    p0 = Pipeline([inc])
+
+    p = p0 @ plus @ twice
+    assert p.advices == (plus, twice)
+    assert p0.advices == () and p.storage is p0.storage
+    assert p.apply().advices == () and p.apply()()(0) == 4
+    assert p()(0) == p.compile()(0) == 4
+    assert p.advise(twice, plus)()(0) == 3
+    assert p.unadvise(twice)()(0) == 2
+    assert p.unadvise(twice).unadvise(plus) == p0
+
+    q = p0 @ cached @ logged @ advices.cacheable()
+    assert q.deduplicate().advices == (logged, q.advices[-1])
+    assert q.unadvise("cacheable").advices == (logged,)
+    assert q.unadvise("cacheable")()(1) == 2 and len(calls) == 2
+
+    assert (p0 @ plus | inc)()(0) == 3
+    assert (p0 @ plus | inc).advices == ()
+    assert (p0 @ plus + p0)()(0) == 3
+    assert (p0 @ plus + p0 @ plus).advices == (plus,)
+    assert (p0 * 3 @ plus)()(0) == 6
+    assert ((p0 | inc) @ plus)[1:].advices == (plus,)
+
+    frozen = p0.freeze() @ plus
+    assert frozen.advices == () and frozen()(0) == 2
+
+    div = Pipeline([lambda x: 10 / x])
+    nine, seven = div @ advices.exceptional(9), div @ advices.exceptional(7)
+    assert nine.digest != seven.digest != div.digest
+    assert hash(nine) != hash(div)
+    assert nine.freeze() is not seven.freeze()
+    assert nine.freeze() is (div @ advices.exceptional(9)).freeze()
+    assert nine.freeze()()(0) == 9 and seven.freeze()()(0) == 7
+
+    r = p0.repeat(10 ** 6, until=lambda x: x > 5) @ plus
+    assert r.apply().storage.body is not None and r.apply()()(0) == 6
+
+    cache = caches.Cache(None)
+    assert (p0 * 2 @ plus).checkpoint(cache)(0) == 4
+    assert (p0 * 2).checkpoint(cache)(0) == 2
+
+    pa = P0 @ advices.optional(0)
+    assert len(pa & P0) == len(pa - pa) == 0 and len(pa - P0) == 3
+    assert not pa << P0 and not pa >> P0 and pa << pa and pa >> pa
+    assert len(pa ^ P0) == len((pa + P0) - (pa & P0)) == 6
+    assert P0[0] in P0 and P0[0] not in pa
+    assert pa.apply()[0] is pa.apply()[0] and pa.apply()[0] in pa
+    assert pa._stack() == (P0 @ pa.advices[0])._stack()
+
+
 # In[16]:
 
 
@@ -263,6 +662,214 @@ def test_call():
     assert P0()(range(10)) == [2, 4, 6, 8, 10]
 
 
+# In[ ]:
+
+
+def test_call_flat():
+    assert P1(flat=True)(range(10)) == 45
+    assert P0(flat=True)(range(10)) == [2, 4, 6, 8, 10]
+
+    deep = Pipeline([inc] * 10000)
+
+    with pytest.raises(RecursionError):
+        deep()(0)
+
+    assert deep(flat=True)(0) == 10000
+
+
+# In[ ]:
+
+
+def test_compile():
+    with pytest.raises(CompositionError) as err:
+        Pipeline([]).compile()
+    assert str(err.value) == "Cannot compose from an empty pipeline."
+
+    assert P1.compile()(range(10)) == 45
+    assert P0.compile()(range(10)) == [2, 4, 6, 8, 10]
+
+    p = Pipeline([(sorted, [], {"key": abs}), (dict.fromkeys, [], {})])
+    assert list(p.compile()([-2, 1])) == [1, -2]
+    assert list(p.compile()([-2, 1], key=None)) == [-2, 1]
+
+    p = Pipeline([dict, (dict, [], {"class": 0, "a b": 1})])
+    assert p.compile()(x=2) == {"x": 2, "class": 0, "a b": 1}
+
+    assert (Pipeline([inc]) * 10000).compile()(0) == 10000
+
+
+# In[ ]:
+
+
+def test_freeze():
+    args = [inc]
+    p = Pipeline([(map, args), (filter, [iseven]), list]).freeze()
+    args.append(inc)
+
+    assert isinstance(p, FrozenPipeline)
+    assert p is P0.freeze() is FrozenPipeline(P0)
+    assert p is p.freeze()
+    assert p is not P1.freeze()
+
+    assert p() is p()
+    assert p(flat=True) is P0.freeze()(flat=True)
+    assert p.compile() is P0.freeze().compile()
+    assert p()(range(10)) == [2, 4, 6, 8, 10]
+    assert hash(p) == hash(P0.freeze())
+
+    with pytest.raises(DefinitionError) as err:
+        p.steps = []
+    assert str(err.value) == "Cannot assign the steps of a frozen pipeline."
+
+    with pytest.raises(AttributeError):
+        with p as steps:
+            steps.append(list)
+
+    assert len(p) == 3
+    assert pickle.loads(pickle.dumps(p)) is p  # interned again
+
+    with ProcessPoolExecutor(1, mp_context=get_context("fork")) as pool:
+        assert pool.submit(FrozenPipeline.stream, p, range(3)).result() == [2]
+
+
+# In[ ]:
+
+
+def test_stream():
+    with pytest.raises(CompositionError) as err:
+        Pipeline([]).stream([])
+    assert str(err.value) == "Cannot compose from an empty pipeline."
+
+    assert P1.stream(range(10)) == 45
+    assert P0.stream(range(10)) == [2, 4, 6, 8, 10]
+
+    pulled = []
+
+    def source():
+        for i in count():
+            pulled.append(i)
+            yield i
+
+    p = P00 + P01 + Pipeline([(filter, [None]), (take, [3])])
+    assert list(p.stream(source())) == [2, 4, 6]
+    assert pulled == [0, 1, 2, 3, 4, 5]
+
+    items = p.stream(source())
+    assert next(items) == 2
+    assert len(pulled) == 8
+
+    p = Pipeline([(dropwhile, [iseven]), (takewhile, [lambda x: x < 5])])
+    assert list(p.stream(range(10))) == [1, 2, 3, 4]
+
+    p = Pipeline([(map, [inc]), sorted, reversed, (take, [0])])
+    assert list(p.stream(range(10))) == []
+
+
+# In[ ]:
+
+
+def test_fuse():
+    p = P0 + Pipeline([(takewhile, [bool]), (map, [inc]), (map, [inc])])
+    fused, report = p.fuse()
+
+    assert report == [range(0, 2), range(3, 6)]
+    assert str(fused) == "push -> list -> push"
+    assert list(fused()(range(10))) == list(p()(range(10)))
+
+    fused, report = p.fuse(3)
+
+    assert report == [range(3, 6)]
+    assert str(fused) == "map -> filter -> list -> push"
+
+    fused, report = P1.fuse()
+
+    assert report == []
+    assert fused.steps == P1.steps
+    assert all(a is b for a, b in zip(fused.steps, P1.steps))
+
+    long = Pipeline([(map, [inc])] * 4096 + [list])
+    fused, report = long.fuse()
+
+    assert report == [range(0, 4096)] and len(fused) == 2
+    assert fused()(range(3)) == [4096, 4097, 4098]
+
+    p = Pipeline(
+        [
+            (starmap, [add]),
+            (take, [12]),
+            (dropwhile, [lambda x: x < 4]),
+            (filterfalse, [iseven]),
+            (takewhile, [lambda x: x < 10]),
+            (filter, [None]),
+            (take, [2]),
+            list,
+        ]
+    )
+    pairs = [(i, 1) for i in range(20)]
+    assert p.fuse(1)[0]()(pairs) == p()(pairs) == [5, 7]
+    assert p.fuse(1)[0]()(pairs[::-1]) == p()(pairs[::-1]) == []
+
+
+# In[ ]:
+
+
+def test_vectorize():
+    np = pytest.importorskip("numpy")
+
+    with pytest.raises(CompositionError) as err:
+        Pipeline([]).vectorize([])
+    assert str(err.value) == "Cannot compose from an empty pipeline."
+
+    assert P0.vectorize(range(10)) == [2, 4, 6, 8, 10]
+    assert P0.vectorize(np.arange(10)) == [2, 4, 6, 8, 10]
+
+    calls = []
+
+    def double(x):
+        calls.append(x)
+        return x * 2
+
+    p = Pipeline(
+        [
+            (map, [np.square]),
+            (filter, [advices.vectorizable()(lambda x: x > 2)]),
+            (map, [double]),
+            (filter, [iseven]),
+            (filter, [None]),
+            sum,
+        ]
+    )
+
+    assert p.vectorize(np.arange(5)) == p()(np.arange(5)) == 58
+    assert calls == [4, 9, 16] * 2
+
+    array = Pipeline([(map, [double]), (filter, [iseven])]).vectorize(
+        np.arange(3)
+    )
+    assert isinstance(array, np.ndarray)
+    assert array.tolist() == [0, 2, 4]
+
+
+# In[ ]:
+
+
+def test_coroutine():
+    with pytest.raises(CompositionError) as err:
+        Pipeline([]).coroutine()
+    assert str(err.value) == "Cannot compose from an empty pipeline."
+
+    async def ainc(x):
+        await asyncio.sleep(0)
+        return x + 1
+
+    p = Pipeline([ainc, inc, (add, [1]), ainc])
+    f = p.coroutine()
+
+    assert asyncio.run(f(0)) == 4
+    assert asyncio.run(P0.coroutine()(range(10))) == [2, 4, 6, 8, 10]
+    assert p.freeze().coroutine() is p.freeze().coroutine()
+
+
 # In[23]:
 
 
@@ -301,6 +908,31 @@ def test_contains():
     assert (reduce, [add]) not in P0
 
 
+# In[ ]:
+
+
+def test_index():
+    p = Pipeline([(add, [1]), (add, [[1]]), (add, [{1}]), (map, [inc])])
+
+    assert len(p.keys) == len(p.index) == 4
+    assert (add, [1.0], {}) in p
+    assert (add, [{1}], {}) in p
+    assert (add, [(1,)], {}) not in p
+    assert (map, [inc], {"x": 0}) not in p
+
+    with p as steps:
+        steps.append((reduce, [add]))
+        assert (reduce, [add]) in p
+
+    assert len(p.index) == 5
+
+    big = Pipeline([(add, [i]) for i in range(10000)])
+
+    assert len(big & big) == len(big) == 10000
+    assert len(big - P1) == len(big ^ P1) - 1 == 10000
+    assert big << big and big >> big
+
+
 # In[27]:
 
 
@@ -354,6 +986,10 @@ def test_ge():
 def test_eq():
     assert not P0 == P1
     assert P0 == P0
+    assert P0 == Pipeline([(map, [inc]), (filter, [iseven]), list])
+    assert not P00 == P01 and not P00 == [(map, [inc], {})]
+    assert not P00 @ advices.loggable(print) == P00
+    assert hash(P0) == hash(Pipeline(P0.steps))
 
 
 # In[33]:
@@ -362,6 +998,8 @@ def test_eq():
 def test_ne():
     assert P0 != P1
     assert not P0 != P0
+    assert P00 != P01 and P00 != [(map, [inc], {})]
+    assert P00 @ advices.loggable(print) != P00
 
 
 # In[34]:
@@ -370,7 +1008,8 @@ def test_ne():
 def test_pow():
     assert P0 ** P0
     assert not P0 ** P1
-    assert P0 == Pipeline([map, filter, list])
+    assert P0 != Pipeline([map, filter, list])
+    assert P0 ** Pipeline([map, filter, list])
 
 
 # In[35]: